@@ -0,0 +1,47 @@
+"""Cold import time of the package and of the modules behind its exports.
+
+Run with ``python benchmarks/bench_import.py [runs]``. Every import is timed in
+a fresh interpreter so nothing is served from an already populated sys.modules.
+"""
+
+import sys
+import subprocess
+
+STATEMENTS = [
+    "pass",
+    "import tdam_api",
+    "from tdam_api import Quote",
+    "from tdam_api import TDClient",
+    "from tdam_api.quotetable import QuoteTable",
+]
+
+TIMER = """
+import sys, time
+start = time.perf_counter()
+{}
+elapsed = time.perf_counter() - start
+heavy = [m for m in ("requests", "attr", "numpy", "pandas") if m in sys.modules]
+print(elapsed, ",".join(heavy))
+"""
+
+
+def time_import(statement: str, runs: int):
+    best, heavy = float("inf"), ""
+    for _ in range(runs):
+        out = subprocess.check_output(
+            [sys.executable, "-c", TIMER.format(statement)], universal_newlines=True
+        ).split()
+        best = min(best, float(out[0]))
+        heavy = out[1] if len(out) > 1 else ""
+    return best, heavy
+
+
+def main(runs: int = 5):
+    print(f"best of {runs} cold imports")
+    for statement in STATEMENTS:
+        best, heavy = time_import(statement, runs)
+        print(f"{statement:45s} {best * 1e3:8.1f} ms  loaded: {heavy or '-'}")
+
+
+if __name__ == "__main__":
+    main(*[int(a) for a in sys.argv[1:2]])
@@ -0,0 +1,61 @@
+"""Per-candle indicator updates against recomputing the full history.
+
+Run with ``python benchmarks/bench_indicators.py [history_len] [new_candles]``.
+"""
+
+import sys
+import time
+
+import numpy as np
+
+from tdam_api.indicators import IndicatorEngine, SMA, EMA, RSI, ATR, VWAP
+
+MINUTE_MS = 60 * 1000
+
+
+def make_candles(n: int):
+    rng = np.random.RandomState(0)
+    close = 100 + np.cumsum(rng.normal(0, 0.05, n))
+    return [
+        {
+            "open": float(c),
+            "high": float(c) + 0.1,
+            "low": float(c) - 0.1,
+            "close": float(c),
+            "volume": 100.0,
+            "datetime": 1566480600000 + i * MINUTE_MS,
+        }
+        for i, c in enumerate(close)
+    ]
+
+
+def make_engine() -> IndicatorEngine:
+    return IndicatorEngine(
+        {"sma": SMA(50), "ema": EMA(20), "rsi": RSI(), "atr": ATR(), "vwap": VWAP()}
+    )
+
+
+def main(history_len: int = 20000, new_candles: int = 500):
+    candles = make_candles(history_len + new_candles)
+    history, new = candles[:history_len], candles[history_len:]
+
+    engine = make_engine()
+    engine.compute(history)
+    start = time.perf_counter()
+    for candle in new:
+        engine.update(candle)
+    incremental = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for i in range(len(new)):
+        make_engine().compute(candles[: history_len + i + 1])
+    full = time.perf_counter() - start
+
+    print(f"history={history_len} new candles={new_candles}")
+    print(f"incremental  {incremental / new_candles * 1e6:10.1f} us/candle")
+    print(f"recompute    {full / new_candles * 1e6:10.1f} us/candle")
+    print(f"speedup      {full / incremental:10.1f}x")
+
+
+if __name__ == "__main__":
+    main(*[int(a) for a in sys.argv[1:3]])
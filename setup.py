@@ -31,7 +31,12 @@ setup(
     package_dir={"": "src"},
     include_package_data=True,
     install_requires=["requests>=2.22.0", "attrs>=19.1.0"],
-    extras_require={"pandas": ["pandas>=0.25.0"]},
+    extras_require={
+        "pandas": ["pandas>=0.25.0"],
+        "numpy": ["numpy>=1.16.0"],
+        "parquet": ["pyarrow>=0.14.0"],
+    },
+    entry_points={"console_scripts": ["tdam=tdam_api.cli:main"]},
     license="MIT",
     zip_safe=False,
     keywords="tdam_api tdameritrade api trading stocks options",
@@ -2,7 +2,27 @@ __author__ = "Jyoti Basu"
 __email__ = "jyotibasu@engineeredtrades.com"
 __version__ = "0.1.0"
 
-from .client import TDClient
-from .entities import Quote
+import sys
+from typing import TYPE_CHECKING
+
+# Public name -> submodule, imported on first attribute access (PEP 562)
+_exports = {"TDClient": ".client", "Quote": ".entities"}
 
 __all__ = ["TDClient", "Quote"]
+
+if TYPE_CHECKING or sys.version_info < (3, 7):
+    # Module __getattr__ is not supported on 3.6, import eagerly there
+    from .client import TDClient
+    from .entities import Quote
+else:
+    import importlib
+
+    def __getattr__(name: str):
+        if name not in _exports:
+            raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+        value = getattr(importlib.import_module(_exports[name], __name__), name)
+        globals()[name] = value
+        return value
+
+    def __dir__():
+        return sorted(set(globals()) | set(__all__))
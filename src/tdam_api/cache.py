@@ -0,0 +1,52 @@
+import time
+import threading
+from datetime import timedelta
+from typing import Any, Dict, Tuple, Iterable, Hashable, Callable, Union
+
+TTL = Union[timedelta, Callable[[], timedelta]]
+
+
+class TTLCache:
+    # ttl can be a callable, e.g. MarketCalendar.session_ttl, evaluated once per write
+    def __init__(self, ttl: TTL, clock: Callable[[], float] = time.time):
+        self.ttl = ttl
+        self._clock = clock
+        self._data: Dict[Hashable, Tuple[float, Any]] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return self.get(key) is not None
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return default
+            expires_at, value = entry
+            if self._clock() >= expires_at:
+                del self._data[key]
+                return default
+            return value
+
+    def _expires_at(self) -> float:
+        ttl = self.ttl() if callable(self.ttl) else self.ttl
+        return self._clock() + ttl.total_seconds()
+
+    def set(self, key: Hashable, value: Any):
+        expires_at = self._expires_at()
+        with self._lock:
+            self._data[key] = (expires_at, value)
+
+    def set_many(self, items: Iterable[Tuple[Hashable, Any]]):
+        # One ttl evaluation for a whole response
+        expires_at = self._expires_at()
+        with self._lock:
+            for key, value in items:
+                self._data[key] = (expires_at, value)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
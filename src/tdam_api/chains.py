@@ -0,0 +1,62 @@
+from typing import Dict, Set
+
+import attr
+
+from .entities import Option, OptionChain
+
+_MISSING = object()
+
+
+def _changed_fields(old: dict, new: dict) -> Set[str]:
+    changed = set()
+    for k, v in new.items():
+        ov = old.get(k, _MISSING)
+        # NaN greeks come back as float('nan'), which never equals itself
+        if ov != v and not (v != v and ov != ov):
+            changed.add(k)
+    changed.update(k for k in old if k not in new)
+    return changed
+
+
+@attr.s(frozen=True)
+class ChainUpdate:
+    added: Set[str] = attr.ib(factory=set)
+    removed: Set[str] = attr.ib(factory=set)
+    changed: Dict[str, Set[str]] = attr.ib(factory=dict)
+
+    def __bool__(self) -> bool:
+        return bool(self.added or self.removed or self.changed)
+
+    @property
+    def contracts(self) -> Set[str]:
+        return self.added | self.removed | set(self.changed)
+
+
+@attr.s(frozen=True)
+class LiveOptionChain(OptionChain):
+    symbol: str = attr.ib(default=None)
+    expiry: str = attr.ib(default=None)
+
+    def apply(self, calls: Dict[str, dict], puts: Dict[str, dict]) -> ChainUpdate:
+        update = ChainUpdate()
+        self._apply_side(self._calls, calls, update)
+        self._apply_side(self._puts, puts, update)
+        return update
+
+    @staticmethod
+    def _apply_side(
+        current: Dict[str, Option], data: Dict[str, dict], update: ChainUpdate
+    ):
+        for strike, new in data.items():
+            old = current.get(strike)
+            if old is None:
+                current[strike] = Option(new)
+                update.added.add(new["symbol"])
+                continue
+            fields = _changed_fields(old._get_data(), new)
+            # Unchanged contracts keep their existing Option
+            if fields:
+                current[strike] = Option(new)
+                update.changed[new["symbol"]] = fields
+        for strike in [s for s in current if s not in data]:
+            update.removed.add(current.pop(strike).symbol)
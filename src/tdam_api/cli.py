@@ -0,0 +1,434 @@
+import sys
+import csv
+import json
+import argparse
+from datetime import datetime
+from typing import List, Dict, Any, Tuple, Iterable, Iterator, TextIO
+
+import requests
+
+from .client import TDClient
+from .common import chunked, map_concurrent
+from .entities import SymbolNotFound, InvalidArgument
+
+Record = Dict[str, Any]
+Columns = List[Tuple[str, str]]
+
+# Symbols per quotes request
+QUOTE_BATCH = 100
+
+# Union of the fields TD returns per asset type, so CSV headers and Parquet
+# schemas do not depend on whichever record happens to come first
+_QUOTE_COMMON = [
+    ("symbol", "str"),
+    ("description", "str"),
+    ("assetType", "str"),
+    ("assetMainType", "str"),
+    ("cusip", "str"),
+    ("exchange", "str"),
+    ("exchangeName", "str"),
+    ("bidPrice", "float"),
+    ("bidSize", "int"),
+    ("bidId", "str"),
+    ("askPrice", "float"),
+    ("askSize", "int"),
+    ("askId", "str"),
+    ("lastPrice", "float"),
+    ("lastSize", "int"),
+    ("lastId", "str"),
+    ("openPrice", "float"),
+    ("highPrice", "float"),
+    ("lowPrice", "float"),
+    ("closePrice", "float"),
+    ("bidTick", "str"),
+    ("netChange", "float"),
+    ("totalVolume", "int"),
+    ("quoteTimeInLong", "int"),
+    ("tradeTimeInLong", "int"),
+    ("mark", "float"),
+    ("volatility", "float"),
+    ("digits", "int"),
+    ("52WkHigh", "float"),
+    ("52WkLow", "float"),
+    ("securityStatus", "str"),
+    ("netPercentChangeInDouble", "float"),
+    ("markChangeInDouble", "float"),
+    ("markPercentChangeInDouble", "float"),
+    ("delayed", "bool"),
+]
+_QUOTE_EQUITY = [
+    ("marginable", "bool"),
+    ("shortable", "bool"),
+    ("nAV", "float"),
+    ("peRatio", "float"),
+    ("divAmount", "float"),
+    ("divYield", "float"),
+    ("divDate", "str"),
+    ("regularMarketLastPrice", "float"),
+    ("regularMarketLastSize", "int"),
+    ("regularMarketNetChange", "float"),
+    ("regularMarketTradeTimeInLong", "int"),
+    ("regularMarketPercentChangeInDouble", "float"),
+]
+_QUOTE_OPTION = [
+    ("contractType", "str"),
+    ("underlying", "str"),
+    ("underlyingPrice", "float"),
+    ("strikePrice", "float"),
+    ("expirationDay", "int"),
+    ("expirationMonth", "int"),
+    ("expirationYear", "int"),
+    ("daysToExpiration", "int"),
+    ("lastTradingDay", "int"),
+    ("multiplier", "float"),
+    ("openInterest", "int"),
+    ("moneyIntrinsicValue", "float"),
+    ("timeValue", "float"),
+    ("theoreticalOptionValue", "float"),
+    ("delta", "float"),
+    ("gamma", "float"),
+    ("theta", "float"),
+    ("vega", "float"),
+    ("rho", "float"),
+    ("impliedYield", "float"),
+    ("uvExpirationType", "str"),
+    ("settlementType", "str"),
+    ("deliverables", "str"),
+]
+QUOTE_COLUMNS: Columns = _QUOTE_COMMON + _QUOTE_EQUITY + _QUOTE_OPTION
+
+CHAIN_COLUMNS: Columns = [
+    ("underlying", "str"),
+    ("expiry", "str"),
+    ("putCall", "str"),
+    ("symbol", "str"),
+    ("description", "str"),
+    ("exchangeName", "str"),
+    ("strikePrice", "float"),
+    ("bid", "float"),
+    ("ask", "float"),
+    ("last", "float"),
+    ("mark", "float"),
+    ("bidSize", "int"),
+    ("askSize", "int"),
+    ("bidAskSize", "str"),
+    ("lastSize", "int"),
+    ("highPrice", "float"),
+    ("lowPrice", "float"),
+    ("openPrice", "float"),
+    ("closePrice", "float"),
+    ("totalVolume", "int"),
+    ("tradeDate", "str"),
+    ("tradeTimeInLong", "int"),
+    ("quoteTimeInLong", "int"),
+    ("netChange", "float"),
+    ("volatility", "float"),
+    ("delta", "float"),
+    ("gamma", "float"),
+    ("theta", "float"),
+    ("vega", "float"),
+    ("rho", "float"),
+    ("openInterest", "int"),
+    ("timeValue", "float"),
+    ("intrinsicValue", "float"),
+    ("theoreticalOptionValue", "float"),
+    ("theoreticalVolatility", "float"),
+    ("optionDeliverablesList", "str"),
+    ("expirationDate", "int"),
+    ("daysToExpiration", "int"),
+    ("expirationType", "str"),
+    ("lastTradingDay", "int"),
+    ("multiplier", "float"),
+    ("settlementType", "str"),
+    ("deliverableNote", "str"),
+    ("isIndexOption", "bool"),
+    ("percentChange", "float"),
+    ("markChange", "float"),
+    ("markPercentChange", "float"),
+    ("inTheMoney", "bool"),
+    ("mini", "bool"),
+    ("nonStandard", "bool"),
+    ("pennyPilot", "bool"),
+]
+
+HISTORY_COLUMNS: Columns = [
+    ("symbol", "str"),
+    ("datetime", "int"),
+    ("open", "float"),
+    ("high", "float"),
+    ("low", "float"),
+    ("close", "float"),
+    ("volume", "int"),
+]
+
+
+def read_symbols(symbols: List[str], files: List[str]) -> Iterator[str]:
+    # Positional symbols, then files ("-" is stdin), one or more symbols per line
+    def lines() -> Iterator[str]:
+        yield from symbols
+        for path in files:
+            if path == "-":
+                yield from sys.stdin
+            else:
+                with open(path) as f:
+                    yield from f
+
+    seen = set()
+    for line in lines():
+        line = line.split("#", 1)[0]
+        for symbol in line.replace(",", " ").split():
+            symbol = symbol.upper()
+            if symbol not in seen:
+                seen.add(symbol)
+                yield symbol
+
+
+def _scalar(value: Any) -> Any:
+    # Nested values (deliverables, instruments) are kept as JSON text
+    if isinstance(value, (dict, list)):
+        return json.dumps(value)
+    return value
+
+
+def _coerce(value: Any, kind: str) -> Any:
+    # Values that do not fit the declared column type are written as null
+    if value is None:
+        return None
+    if kind == "str":
+        return str(_scalar(value))
+    if kind == "bool":
+        return value if isinstance(value, bool) else None
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        return None
+    if kind == "int":
+        return int(value) if float(value).is_integer() else None
+    return float(value)
+
+
+class _DroppedKeys:
+    # Keys outside the declared columns are reported once, not silently lost
+    def __init__(self, columns: Columns):
+        self._known = {name for name, _ in columns}
+
+    def check(self, record: Record):
+        extra = [k for k in record if k not in self._known]
+        if extra:
+            print(f"tdam: not exported: {', '.join(extra)}", file=sys.stderr)
+            self._known.update(extra)
+
+
+class NdjsonWriter:
+    def __init__(self, out: TextIO):
+        self._out = out
+
+    def write(self, record: Record):
+        self._out.write(json.dumps(record) + "\n")
+
+    def close(self):
+        self._out.flush()
+
+
+class CsvWriter:
+    def __init__(self, out: TextIO, columns: Columns):
+        self._out = out
+        self._dropped = _DroppedKeys(columns)
+        self._writer = csv.DictWriter(
+            out, fieldnames=[name for name, _ in columns], extrasaction="ignore"
+        )
+        self._writer.writeheader()
+
+    def write(self, record: Record):
+        self._dropped.check(record)
+        self._writer.writerow({k: _scalar(v) for k, v in record.items()})
+
+    def close(self):
+        self._out.flush()
+
+
+class ParquetWriter:
+    # Buffered into row groups, only one batch of records is held at a time
+    def __init__(self, path: str, columns: Columns, batch_size: int = 10000):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        types = {
+            "str": pa.string(),
+            "int": pa.int64(),
+            "float": pa.float64(),
+            "bool": pa.bool_(),
+        }
+        self._pa = pa
+        self.path = path
+        self.batch_size = batch_size
+        self._columns = columns
+        self._dropped = _DroppedKeys(columns)
+        # Explicit schema, an all-null or all-int first batch cannot narrow it
+        self._schema = pa.schema([(name, types[kind]) for name, kind in columns])
+        self._writer = pq.ParquetWriter(path, self._schema)
+        self._batch: List[Record] = []
+
+    def write(self, record: Record):
+        self._dropped.check(record)
+        self._batch.append(record)
+        if len(self._batch) >= self.batch_size:
+            self._flush()
+
+    def _flush(self):
+        if not self._batch:
+            return
+        data = {
+            name: [_coerce(r.get(name), kind) for r in self._batch]
+            for name, kind in self._columns
+        }
+        table = self._pa.Table.from_pydict(data, schema=self._schema)
+        self._writer.write_table(table)
+        self._batch = []
+
+    def close(self):
+        self._flush()
+        self._writer.close()
+
+
+def _skip_missing(fn):
+    # One bad symbol should not abort a bulk export
+    def wrapper(item):
+        try:
+            return fn(item)
+        except (SymbolNotFound, InvalidArgument, requests.HTTPError) as e:
+            print(f"tdam: skipping {item}: {e}", file=sys.stderr)
+            return []
+
+    return wrapper
+
+
+def quote_records(client: TDClient, symbols: Iterable[str], args) -> Iterator[Record]:
+    @_skip_missing
+    def fetch(batch: List[str]) -> List[Record]:
+        return [q._get_data() for q in client.quotes(batch).values()]
+
+    for records in map_concurrent(fetch, chunked(symbols, QUOTE_BATCH), args.workers):
+        yield from records
+
+
+def chain_records(client: TDClient, symbols: Iterable[str], args) -> Iterator[Record]:
+    @_skip_missing
+    def fetch(symbol: str) -> List[Record]:
+        chain = client.get_option_chain(symbol, args.expiry)
+        return [
+            dict(o._get_data(), underlying=symbol, expiry=args.expiry)
+            for o in chain.options()
+        ]
+
+    for records in map_concurrent(fetch, symbols, args.workers):
+        yield from records
+
+
+def history_records(client: TDClient, symbols: Iterable[str], args) -> Iterator[Record]:
+    @_skip_missing
+    def fetch(symbol: str) -> List[Record]:
+        candles = client.get_history(
+            symbol,
+            start_dt=args.start,
+            end_dt=args.end,
+            freq=args.freq,
+            outside_rth=args.outside_rth,
+        )
+        return [dict(c, symbol=symbol) for c in candles or []]
+
+    for records in map_concurrent(fetch, symbols, args.workers):
+        yield from records
+
+
+def _date(value: str) -> datetime:
+    try:
+        return datetime.strptime(value, "%Y-%m-%d")
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid date {value!r}, expected yyyy-mm-dd")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="tdam", description="Bulk export quotes, option chains and history."
+    )
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("symbols", nargs="*", help="symbols to fetch")
+    common.add_argument(
+        "-f",
+        "--file",
+        action="append",
+        default=[],
+        help="file with symbols, one or more per line, '-' for stdin",
+    )
+    common.add_argument(
+        "--format", choices=["ndjson", "csv", "parquet"], default="ndjson"
+    )
+    common.add_argument("-o", "--output", help="output file, default stdout")
+    common.add_argument("-w", "--workers", type=int, default=4)
+    common.add_argument(
+        "--no-auth",
+        action="store_true",
+        help="use only the app id (TDAM_APP_ID), delayed data",
+    )
+
+    commands = parser.add_subparsers(dest="command")
+    commands.required = True
+    quotes = commands.add_parser("quotes", parents=[common], help="quotes")
+    quotes.set_defaults(records=quote_records, columns=QUOTE_COLUMNS)
+
+    chain = commands.add_parser("chain", parents=[common], help="option chains")
+    chain.add_argument("--expiry", required=True, help="yyyy-mm-dd")
+    chain.set_defaults(records=chain_records, columns=CHAIN_COLUMNS)
+
+    history = commands.add_parser("history", parents=[common], help="price history")
+    history.add_argument("--start", type=_date, required=True, help="yyyy-mm-dd")
+    history.add_argument(
+        "--end", type=_date, default=datetime.today(), help="yyyy-mm-dd"
+    )
+    history.add_argument(
+        "--freq",
+        default="d",
+        choices=["d", "w", "m", "1min", "5min", "10min", "15min", "30min"],
+    )
+    history.add_argument("--outside-rth", action="store_true")
+    history.set_defaults(records=history_records, columns=HISTORY_COLUMNS)
+    return parser
+
+
+def main(argv: List[str] = None) -> int:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+
+    files = args.file
+    if not args.symbols and not files:
+        # Nothing given on the command line, read symbols from stdin
+        files = ["-"]
+
+    if args.format == "parquet":
+        if args.output is None:
+            parser.error("parquet output needs --output")
+        try:
+            writer = ParquetWriter(args.output, args.columns)
+        except ImportError:
+            parser.error("parquet output needs pyarrow, pip install pyarrow")
+        out = None
+    else:
+        out = open(args.output, "w", newline="") if args.output else sys.stdout
+        if args.format == "ndjson":
+            writer = NdjsonWriter(out)
+        else:
+            writer = CsvWriter(out, args.columns)
+
+    client = TDClient(authenticated=not args.no_auth)
+    symbols = read_symbols(args.symbols, files)
+    try:
+        for record in args.records(client, symbols, args):
+            writer.write(record)
+    finally:
+        writer.close()
+        if out is not None and out is not sys.stdout:
+            out.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,23 +1,47 @@
 import os
 import functools
-from typing import List, Dict
-from datetime import datetime, timedelta
+from typing import List, Dict, Union, Iterator, TYPE_CHECKING
+from datetime import date, datetime, timedelta
 
 import requests
 
 from .urls import Urls
+from .cache import TTLCache, TTL
+from .profiling import Profiler, NullProfiler
+from .common import chunked, unique, map_concurrent
+from .transactions import (
+    Window,
+    DEFAULT_WINDOW,
+    TransactionCache,
+    date_windows,
+    is_closed,
+    flatten,
+)
 from .entities import (
     Quote,
     Instrument,
     Fundamental,
+    MarketHours,
+    Mover,
     Stock,
     Option,
     OptionChain,
+    Order,
+    Transaction,
     SymbolNotFound,
     InvalidArgument,
     AuthenticationRequired,
+    OrderStateUnknown,
 )
 
+if TYPE_CHECKING:
+    from .instruments import InstrumentMaster
+    from .hours import MarketCalendar
+    from .quotetable import QuoteTable
+    from .chains import LiveOptionChain, ChainUpdate
+    from .volsurface import VolSurface
+    from .orders import IdempotencyGuard, OrderTracker
+
 
 def auth_required(f):
     @functools.wraps(f)
@@ -31,8 +55,21 @@ def auth_required(f):
 
 
 class TDClient:
+    # Symbols per combined instruments request, keeps the query string reasonable
+    fundamentals_chunk_size = 500
+    movers_indexes = ["$DJI", "$COMPX", "$SPX.X"]
+
     def __init__(
-        self, access_token=None, refresh_token=None, app_id=None, authenticated=True
+        self,
+        access_token=None,
+        refresh_token=None,
+        app_id=None,
+        authenticated=True,
+        fundamentals_ttl: TTL = timedelta(days=1),
+        movers_ttl: TTL = timedelta(minutes=1),
+        transactions_cache: TransactionCache = None,
+        profile: bool = False,
+        session_aware: bool = False,
     ):
         if authenticated:
             self.access_token = self._get_auth_var(access_token, "TDAM_ACCESS_TOKEN")
@@ -40,6 +77,27 @@ class TDClient:
 
         self.app_id = self._get_auth_var(app_id, "TDAM_APP_ID")
         self._authenticated = authenticated
+        self._instrument_master = None
+        self._fundamentals_cache = TTLCache(fundamentals_ttl)
+        self._movers_cache = TTLCache(movers_ttl)
+        self._calendars: Dict[str, "MarketCalendar"] = {}
+        if session_aware:
+            self.use_market_calendar()
+        self._idempotency_guard = None
+        if transactions_cache is None:
+            transactions_cache = TransactionCache()
+        self._transactions_cache = transactions_cache
+        self.profiler = Profiler() if profile else NullProfiler()
+
+    def enable_profiling(self, trace_memory: bool = False) -> Profiler:
+        # Hands tracemalloc back first so the new profiler can take ownership
+        self.profiler.stop()
+        self.profiler = Profiler(trace_memory=trace_memory)
+        return self.profiler
+
+    def disable_profiling(self):
+        self.profiler.stop()
+        self.profiler = NullProfiler()
 
     def _get_auth_var(self, param: str, env_var: str) -> str:
         if param is None:
@@ -90,32 +148,53 @@ class TDClient:
         resp.raise_for_status()
 
     @auth_required
-    def _post_with_retry(self, url, data) -> requests.Response:
-        resp: requests.Response = requests.post(
-            url, json=data, headers=self._auth_header()
+    def _send_with_retry(self, method: str, url: str, data=None) -> requests.Response:
+        # Order endpoints answer 201 Created on POST/PUT
+        resp: requests.Response = requests.request(
+            method, url, json=data, headers=self._auth_header()
         )
 
-        if resp.status_code == 200:
+        if resp.status_code in (200, 201):
             return resp
         elif resp.status_code == 401:
+            # A 401 was rejected before reaching the order book, resending is safe
             self._update_access_token()
-            resp = requests.post(url, json=data, headers=self._auth_header())
-            if resp.status_code == 200:
+            resp = requests.request(method, url, json=data, headers=self._auth_header())
+            if resp.status_code in (200, 201):
                 return resp
 
         # resp will contain the latest http call response
         resp.raise_for_status()
 
-    def quotes(self, symbols: List[str]) -> Dict[str, Quote]:
+    def _post_with_retry(self, url, data) -> requests.Response:
+        return self._send_with_retry("POST", url, data)
+
+    def _put_with_retry(self, url, data) -> requests.Response:
+        return self._send_with_retry("PUT", url, data)
+
+    def _delete_with_retry(self, url) -> requests.Response:
+        return self._send_with_retry("DELETE", url)
+
+    def _get_quotes(self, symbols: List[str]) -> dict:
         params = {"symbol": (",".join(symbols)).upper()}
         resp: requests.Response = self._get_with_retry(Urls.quote, params=params)
         output = resp.json()
-        output = {k: Quote(v) for k, v in output.items()}
         if output:
             return output
         else:
             raise SymbolNotFound(f"{','.join(symbols)} not found")
 
+    def quotes(self, symbols: List[str]) -> Dict[str, Quote]:
+        output = self._get_quotes(symbols)
+        return {k: Quote(v) for k, v in output.items()}
+
+    def quotes_table(
+        self, symbols: List[str], fields: List[str] = None
+    ) -> "QuoteTable":
+        from .quotetable import QuoteTable
+
+        return QuoteTable.from_response(self._get_quotes(symbols), fields)
+
     def quote(self, symbol: str) -> Quote:
         symbol = symbol.upper()
         output = self.quotes([symbol])
@@ -125,19 +204,147 @@ class TDClient:
         output = self.quote(symbol)
         return Stock(output._get_data())
 
-    def find_instrument(self, symbol_pattern: str) -> Dict[str, Instrument]:
+    def _search_instruments(self, symbol_pattern: str) -> Dict[str, Instrument]:
         params = {"symbol": symbol_pattern, "projection": "symbol-regex"}
         resp: requests.Response = self._get_with_retry(Urls.search, params=params)
         output = resp.json()
         output = {k: Instrument(v) for k, v in output.items()}
         return output
 
+    def find_instrument(self, symbol_pattern: str) -> Dict[str, Instrument]:
+        master = self._instrument_master
+        if master is not None and master.covers(symbol_pattern):
+            return master.search(symbol_pattern)
+        return self._search_instruments(symbol_pattern)
+
+    def load_instrument_master(
+        self, patterns: List[str] = None, max_age: float = None
+    ) -> "InstrumentMaster":
+        from .instruments import InstrumentMaster
+
+        if self._instrument_master is None:
+            self._instrument_master = InstrumentMaster(self)
+        self._instrument_master.refresh(patterns, max_age=max_age)
+        return self._instrument_master
+
     def get_fundamentals(self, symbol: str) -> Fundamental:
         symbol = symbol.upper()
-        params = {"symbol": symbol, "projection": "fundamental"}
-        resp: requests.Response = self._get_with_retry(Urls.search, params=params)
+        output = self.get_fundamentals_many([symbol])
+        if symbol not in output:
+            raise SymbolNotFound(f"{symbol} not found")
+        return output[symbol]
+
+    def get_fundamentals_many(self, symbols: List[str], as_frame: bool = False):
+        symbols = unique(s.upper() for s in symbols)
+        found: Dict[str, Fundamental] = {}
+        missing = []
+        for symbol in symbols:
+            cached = self._fundamentals_cache.get(symbol)
+            if cached is None:
+                missing.append(symbol)
+            else:
+                found[symbol] = cached
+
+        for chunk in chunked(missing, self.fundamentals_chunk_size):
+            params = {"symbol": ",".join(chunk), "projection": "fundamental"}
+            resp: requests.Response = self._get_with_retry(
+                Urls.fundamental, params=params
+            )
+            fetched = {k: Fundamental(v["fundamental"]) for k, v in resp.json().items()}
+            self._fundamentals_cache.set_many(fetched.items())
+            found.update(fetched)
+
+        output = {s: found[s] for s in symbols if s in found}
+        if as_frame:
+            import pandas as pd
+
+            return pd.DataFrame.from_dict(
+                {k: v._get_data() for k, v in output.items()}, orient="index"
+            )
+        return output
+
+    def _get_movers(self, index: str, direction: str, change: str) -> List[dict]:
+        key = (index, direction, change)
+        cached = self._movers_cache.get(key)
+        if cached is not None:
+            return cached
+        params = {"direction": direction, "change": change}
+        resp: requests.Response = self._get_with_retry(
+            Urls.movers % index, params=params
+        )
         output = resp.json()
-        return Fundamental(output[symbol]["fundamental"])
+        self._movers_cache.set(key, output)
+        return output
+
+    def get_movers(
+        self,
+        indexes: List[str] = None,
+        directions: List[str] = ("up", "down"),
+        change: str = "percent",
+        limit: int = None,
+        max_workers: int = 4,
+        as_frame: bool = False,
+    ):
+        indexes = unique(i.upper() for i in (indexes or self.movers_indexes))
+        directions = unique(d.lower() for d in directions)
+        if any(d not in ("up", "down") for d in directions):
+            raise InvalidArgument("Direction should be one of up, down")
+        if change not in ("percent", "value"):
+            raise InvalidArgument("Change should be one of percent, value")
+
+        queries = [(i, d) for i in indexes for d in directions]
+        results = map_concurrent(
+            lambda r: self._get_movers(r[0], r[1], change), queries, max_workers
+        )
+        # A symbol moving in several indexes is listed once with all of them
+        merged: Dict[str, dict] = {}
+        for (index, _), movers in zip(queries, results):
+            for mover in movers:
+                entry = merged.get(mover["symbol"])
+                if entry is None:
+                    entry = merged[mover["symbol"]] = dict(mover, indexes=[])
+                entry["indexes"].append(index)
+
+        ranked = sorted(merged.values(), key=lambda m: -abs(m.get("change", 0.0)))
+        output = [Mover(m) for m in ranked[:limit]]
+        if as_frame:
+            import pandas as pd
+
+            return pd.DataFrame([m._get_data() for m in output]).set_index("symbol")
+        return output
+
+    def get_market_hours(
+        self, markets: List[str] = None, day: date = None
+    ) -> Dict[str, MarketHours]:
+        if markets is None:
+            markets = ["EQUITY"]
+        if day is None:
+            day = date.today()
+        params = {"markets": ",".join(markets).upper(), "date": day.isoformat()}
+        resp: requests.Response = self._get_with_retry(Urls.hours, params=params)
+        output = {}
+        for market in resp.json().values():
+            for product, hours in market.items():
+                output[product] = MarketHours(hours)
+        return output
+
+    def market_calendar(self, market: str = "EQUITY") -> "MarketCalendar":
+        from .hours import MarketCalendar
+
+        market = market.upper()
+        if market not in self._calendars:
+            self._calendars[market] = MarketCalendar(self, market)
+        return self._calendars[market]
+
+    def use_market_calendar(
+        self, market: str = "EQUITY", outside_rth: bool = False
+    ) -> "MarketCalendar":
+        # Cached fundamentals and movers outlive the configured ttl while closed
+        calendar = self.market_calendar(market)
+        for cache in (self._fundamentals_cache, self._movers_cache):
+            open_ttl = getattr(cache.ttl, "open_ttl", cache.ttl)
+            cache.ttl = calendar.session_ttl(open_ttl, outside_rth=outside_rth)
+        return calendar
 
     def get_history(
         self,
@@ -182,10 +389,13 @@ class TDClient:
             "startDate": int(start_dt.timestamp()) * 1000,
             "endDate": int(end_dt.timestamp()) * 1000,
         }
-        resp: requests.Response = self._get_with_retry(
-            Urls.history % symbol, params=params
-        )
-        output = resp.json()
+        span = self.profiler.span
+        with span("get_history.request"):
+            resp: requests.Response = self._get_with_retry(
+                Urls.history % symbol, params=params
+            )
+        with span("get_history.json"):
+            output = resp.json()
 
         if output["empty"]:
             return None
@@ -202,17 +412,24 @@ class TDClient:
     ):
         import pandas as pd
 
-        output = self.get_history(
-            symbol, start_dt=start_dt, end_dt=end_dt, freq=freq, outside_rth=outside_rth
-        )
-        if output is None:
-            return None
+        span = self.profiler.span
+        with span("get_history_df"):
+            output = self.get_history(
+                symbol,
+                start_dt=start_dt,
+                end_dt=end_dt,
+                freq=freq,
+                outside_rth=outside_rth,
+            )
+            if output is None:
+                return None
 
-        df = pd.DataFrame(output)
-        df["datetime"] = pd.to_datetime(df["datetime"], unit="ms")
+            with span("get_history_df.frame"):
+                df = pd.DataFrame(output)
+                df["datetime"] = pd.to_datetime(df["datetime"], unit="ms")
 
-        df.set_index("datetime", inplace=True)
-        return df
+                df.set_index("datetime", inplace=True)
+            return df
 
     def get_expirations(self, symbol: str = None) -> List[str]:
         symbol = symbol.upper()
@@ -231,7 +448,7 @@ class TDClient:
 
         return expiries
 
-    def get_option_chain(self, symbol: str = None, expiry: str = None) -> OptionChain:
+    def _get_chain_data(self, symbol: str, expiry: str):
         if symbol is None or expiry is None:
             raise InvalidArgument("symbol and expiry (yyyy-mm-dd) are required")
         symbol = symbol.upper()
@@ -242,21 +459,69 @@ class TDClient:
             "fromDate": expiry,
             "toDate": expiry,
         }
-        resp: requests.Response = self._get_with_retry(Urls.option_chain, params=params)
-        output = resp.json()
-        calls: Dict[str, Option] = {}
-        puts: Dict[str, Option] = {}
-        for exp, options in output["callExpDateMap"].items():
-            if expiry in exp:
-                for s in options.keys():
-                    calls[s] = Option(options[s][0])
-        for exp, options in output["putExpDateMap"].items():
-            if expiry in exp:
-                for s in options.keys():
-                    puts[s] = Option(options[s][0])
-        chain = OptionChain(calls, puts)
+        span = self.profiler.span
+        with span("option_chain.request"):
+            resp: requests.Response = self._get_with_retry(
+                Urls.option_chain, params=params
+            )
+        with span("option_chain.json"):
+            output = resp.json()
+        calls: Dict[str, dict] = {}
+        puts: Dict[str, dict] = {}
+        with span("option_chain.walk"):
+            for exp, options in output["callExpDateMap"].items():
+                if expiry in exp:
+                    for s in options.keys():
+                        calls[s] = options[s][0]
+            for exp, options in output["putExpDateMap"].items():
+                if expiry in exp:
+                    for s in options.keys():
+                        puts[s] = options[s][0]
+        return calls, puts
+
+    def get_option_chain(self, symbol: str = None, expiry: str = None) -> OptionChain:
+        span = self.profiler.span
+        with span("get_option_chain"):
+            calls, puts = self._get_chain_data(symbol, expiry)
+            with span("get_option_chain.options"):
+                chain = OptionChain(
+                    {k: Option(v) for k, v in calls.items()},
+                    {k: Option(v) for k, v in puts.items()},
+                )
+            return chain
+
+    def get_live_option_chain(
+        self, symbol: str = None, expiry: str = None
+    ) -> "LiveOptionChain":
+        from .chains import LiveOptionChain
+
+        calls, puts = self._get_chain_data(symbol, expiry)
+        chain = LiveOptionChain({}, {}, symbol=symbol.upper(), expiry=expiry)
+        chain.apply(calls, puts)
         return chain
 
+    def refresh_option_chain(self, chain: "LiveOptionChain") -> "ChainUpdate":
+        return chain.apply(*self._get_chain_data(chain.symbol, chain.expiry))
+
+    def get_vol_surface(
+        self,
+        symbol: str = None,
+        expiries: List[str] = None,
+        as_of: date = None,
+        max_workers: int = 4,
+    ) -> "VolSurface":
+        from .volsurface import VolSurface
+
+        if expiries is None:
+            expiries = self.get_expirations(symbol)
+        chains = map_concurrent(
+            lambda e: self.get_option_chain(symbol, e), expiries, max_workers
+        )
+        return VolSurface(dict(zip(expiries, chains)), as_of=as_of)
+
+    def refresh_vol_surface(self, surface: "VolSurface", symbol: str, expiry: str):
+        surface.update(expiry, self.get_option_chain(symbol, expiry))
+
     def get_option(
         self,
         symbol: str = None,
@@ -290,3 +555,166 @@ class TDClient:
             if expiry in e:
                 out = Option(data[e][Option.float_to_strike(strike)][0])
                 return out
+
+    @staticmethod
+    def _order_id(resp: requests.Response) -> str:
+        # Placed and replaced orders only come back as a Location header
+        location = resp.headers.get("Location", "").rstrip("/")
+        if not location:
+            raise OrderStateUnknown(
+                f"Order accepted with status {resp.status_code} but no order id"
+            )
+        return location.rsplit("/", 1)[-1]
+
+    def _order_guard(self) -> "IdempotencyGuard":
+        from .orders import IdempotencyGuard
+
+        if self._idempotency_guard is None:
+            self._idempotency_guard = IdempotencyGuard()
+        return self._idempotency_guard
+
+    @auth_required
+    def place_order(self, account_id: str, order: dict, key: str = None) -> str:
+        def submit() -> str:
+            resp = self._post_with_retry(Urls.order_for_account % account_id, order)
+            return self._order_id(resp)
+
+        if key is None:
+            return submit()
+        return self._order_guard().run(key, submit)
+
+    @auth_required
+    def place_orders(
+        self,
+        account_id: str,
+        orders: List[dict],
+        keys: List[str] = None,
+        max_workers: int = 4,
+    ) -> List[Union[str, Exception]]:
+        # One order id or exception per order, in input order. Raising on the
+        # first failure would hide which of the other orders went through.
+        if keys is None:
+            keys = [None] * len(orders)
+        if len(keys) != len(orders):
+            raise InvalidArgument("keys should have one entry per order")
+
+        def place(item) -> Union[str, Exception]:
+            try:
+                return self.place_order(account_id, item[0], key=item[1])
+            except Exception as e:
+                return e
+
+        return list(map_concurrent(place, zip(orders, keys), max_workers))
+
+    @auth_required
+    def replace_order(self, account_id: str, order_id: str, order: dict) -> str:
+        resp = self._put_with_retry(Urls.order % (account_id, order_id), order)
+        return self._order_id(resp)
+
+    @auth_required
+    def cancel_order(self, account_id: str, order_id: str):
+        self._delete_with_retry(Urls.order % (account_id, order_id))
+
+    @auth_required
+    def get_order(self, account_id: str, order_id: str) -> Order:
+        resp: requests.Response = self._get_with_retry(
+            Urls.order % (account_id, order_id), params={}
+        )
+        return Order(resp.json())
+
+    @auth_required
+    def get_orders(
+        self,
+        account_id: str = None,
+        status: str = None,
+        from_entered: date = None,
+        to_entered: date = None,
+    ) -> List[Order]:
+        params = {}
+        if status is not None:
+            params["status"] = status.upper()
+        if from_entered is not None:
+            params["fromEnteredTime"] = from_entered.isoformat()
+        if to_entered is not None:
+            params["toEnteredTime"] = to_entered.isoformat()
+        if account_id is None:
+            url = Urls.all_orders
+        else:
+            url = Urls.order_for_account % account_id
+        resp: requests.Response = self._get_with_retry(url, params=params)
+        return [Order(o) for o in resp.json()]
+
+    def order_tracker(self, account_id: str, max_workers: int = 4) -> "OrderTracker":
+        from .orders import OrderTracker
+
+        return OrderTracker(self, account_id, max_workers=max_workers)
+
+    def _get_transactions_window(
+        self, account_id: str, window: Window, type: str, symbol: str
+    ) -> List[dict]:
+        lo, hi = window
+        key = (account_id, type, symbol, lo.isoformat(), hi.isoformat())
+        cached = self._transactions_cache.get(key)
+        if cached is not None:
+            return cached
+
+        today = date.today()
+        if lo > today:
+            # Nothing has happened yet, and TD rejects startDate after endDate
+            return []
+        # The window still open is only asked for up to today
+        until = min(hi, today)
+        params = {
+            "type": type,
+            "startDate": lo.isoformat(),
+            "endDate": until.isoformat(),
+        }
+        if symbol is not None:
+            params["symbol"] = symbol
+        resp: requests.Response = self._get_with_retry(
+            Urls.transactions % account_id, params=params
+        )
+        # Newest first from the API, oldest first for callers
+        data = sorted(resp.json(), key=lambda t: t.get("transactionDate", ""))
+        if is_closed(window):
+            self._transactions_cache.set(key, data)
+        return data
+
+    @auth_required
+    def iter_transactions(
+        self,
+        account_id: str,
+        start: date = None,
+        end: date = None,
+        type: str = "ALL",
+        symbol: str = None,
+        window: timedelta = DEFAULT_WINDOW,
+        max_workers: int = 4,
+    ) -> Iterator[Transaction]:
+        if start is None:
+            raise InvalidArgument("Start Date is required")
+        end = end or date.today()
+        if isinstance(start, datetime):
+            start = start.date()
+        if isinstance(end, datetime):
+            end = end.date()
+        if end < start:
+            raise InvalidArgument("Start Date should be before End Date")
+        type = type.upper()
+        symbol = symbol.upper() if symbol else None
+
+        # Windows are fetched concurrently but yielded in date order
+        windows = map_concurrent(
+            lambda w: self._get_transactions_window(account_id, w, type, symbol),
+            date_windows(start, end, window),
+            max_workers,
+        )
+        return flatten(windows, start, end)
+
+    def get_transactions(self, account_id: str, *args, **kwargs) -> List[Transaction]:
+        return list(self.iter_transactions(account_id, *args, **kwargs))
+
+    def get_transactions_df(self, account_id: str, *args, **kwargs):
+        from .transactions import transactions_frame
+
+        return transactions_frame(self.iter_transactions(account_id, *args, **kwargs))
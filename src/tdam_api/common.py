@@ -0,0 +1,42 @@
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, Future
+from typing import List, Iterable, Iterator, TypeVar, Callable, Deque
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+def chunked(items: Iterable[T], size: int) -> Iterator[List[T]]:
+    chunk: List[T] = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def unique(items: Iterable[T]) -> List[T]:
+    return list(dict.fromkeys(items))
+
+
+def number(value) -> float:
+    # JSON numbers as floats, anything else (None, strings, bools) as NaN
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return float(value)
+    return float("nan")
+
+
+def map_concurrent(
+    fn: Callable[[T], R], items: Iterable[T], max_workers: int = 4
+) -> Iterator[R]:
+    # Results come back in input order with at most max_workers calls in flight
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        pending: Deque[Future] = deque()
+        for item in items:
+            pending.append(executor.submit(fn, item))
+            if len(pending) >= max_workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
@@ -1,4 +1,4 @@
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterator
 
 import attr
 
@@ -74,6 +74,10 @@ class OptionChain:
             return self._puts.get(key, None)
         raise InvalidArgument("right should be one of (c)all or (p)ut")
 
+    def options(self) -> Iterator[Option]:
+        yield from self._calls.values()
+        yield from self._puts.values()
+
     def get_vertical(
         self, right: str = "C", long_strike: float = None, short_strike: float = None
     ) -> VerticalSpread:
@@ -98,6 +102,18 @@ class Order(Entity):
     pass
 
 
+class Transaction(Entity):
+    pass
+
+
+class Mover(Entity):
+    pass
+
+
+class MarketHours(Entity):
+    pass
+
+
 # Custom Exceptions
 class SymbolNotFound(ValueError):
     pass
@@ -109,3 +125,7 @@ class InvalidArgument(ValueError):
 
 class AuthenticationRequired(Exception):
     pass
+
+
+class OrderStateUnknown(Exception):
+    pass
@@ -0,0 +1,110 @@
+import threading
+from datetime import date, datetime, timedelta, timezone
+from typing import List, Dict, Tuple, Callable
+
+from .entities import MarketHours
+
+Session = Tuple[datetime, datetime]
+
+_RTH = ("regularMarket",)
+_ALL_SESSIONS = ("preMarket", "regularMarket", "postMarket")
+
+
+def parse_session_time(value: str) -> datetime:
+    # "2019-08-23T09:30:00-04:00", strptime on 3.6 cannot handle the colon in %z
+    if len(value) > 6 and value[-3] == ":" and value[-6] in "+-":
+        value = value[:-3] + value[-2:]
+    return datetime.strptime(value, "%Y-%m-%dT%H:%M:%S%z")
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+class MarketCalendar:
+    def __init__(
+        self,
+        client,
+        market: str = "EQUITY",
+        now: Callable[[], datetime] = _utcnow,
+    ):
+        self._client = client
+        self.market = market.upper()
+        self._now = now
+        self._days: Dict[date, MarketHours] = {}
+        # Parsed once per day, ttl lookups walk them on every cache write
+        self._sessions: Dict[Tuple[date, bool], List[Session]] = {}
+        self._lock = threading.Lock()
+
+    def hours(self, day: date) -> MarketHours:
+        with self._lock:
+            if day not in self._days:
+                output = self._client.get_market_hours([self.market], day)
+                self._days[day] = next(iter(output.values()))
+            return self._days[day]
+
+    def sessions(self, day: date, outside_rth: bool = False) -> List[Session]:
+        key = (day, outside_rth)
+        cached = self._sessions.get(key)
+        if cached is not None:
+            return cached
+        hours = self.hours(day)
+        out = []
+        if hours.isOpen:
+            session_hours = hours._get_data().get("sessionHours") or {}
+            for name in _ALL_SESSIONS if outside_rth else _RTH:
+                for s in session_hours.get(name) or []:
+                    out.append(
+                        (parse_session_time(s["start"]), parse_session_time(s["end"]))
+                    )
+            out.sort()
+        with self._lock:
+            return self._sessions.setdefault(key, out)
+
+    def _around(self, at: datetime, days: int, outside_rth: bool) -> List[Session]:
+        # Session dates are exchange local, look one day back to cover UTC rollover
+        first = at.date() - timedelta(days=1)
+        out = []
+        for i in range(days + 1):
+            out.extend(self.sessions(first + timedelta(days=i), outside_rth))
+        return out
+
+    def is_open(self, at: datetime = None, outside_rth: bool = False) -> bool:
+        at = at or self._now()
+        return any(start <= at < end for start, end in self._around(at, 1, outside_rth))
+
+    def next_open(
+        self, at: datetime = None, outside_rth: bool = False, max_days: int = 10
+    ) -> datetime:
+        at = at or self._now()
+        first = at.date() - timedelta(days=1)
+        for i in range(max_days + 1):
+            for start, end in self.sessions(first + timedelta(days=i), outside_rth):
+                if start > at:
+                    return start
+        return None
+
+    def time_to_open(
+        self, at: datetime = None, outside_rth: bool = False, max_days: int = 10
+    ) -> timedelta:
+        at = at or self._now()
+        if self.is_open(at, outside_rth):
+            return timedelta(0)
+        start = self.next_open(at, outside_rth, max_days)
+        if start is None:
+            return timedelta(days=max_days)
+        return start - at
+
+    def session_ttl(
+        self, open_ttl: timedelta, outside_rth: bool = False
+    ) -> Callable[[], timedelta]:
+        # Data cached while the market is closed stays valid until the next open
+        def ttl() -> timedelta:
+            return max(open_ttl, self.time_to_open(outside_rth=outside_rth))
+
+        # Kept so the ttl can be re-wrapped, e.g. for another market
+        ttl.open_ttl = open_ttl
+        return ttl
+
+    def poll_delay(self, interval: float, outside_rth: bool = False) -> float:
+        return max(interval, self.time_to_open(outside_rth=outside_rth).total_seconds())
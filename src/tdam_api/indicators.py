@@ -0,0 +1,244 @@
+from abc import ABC, abstractmethod
+from collections import deque
+from typing import Dict
+
+import numpy as np
+
+from .resample import Bars, candles_to_arrays, local_times
+
+Candle = Dict[str, float]
+
+# Shortest possible local day (DST change), anything closer is the same session
+SAME_SESSION_MS = 23 * 3600 * 1000
+
+
+def history_arrays(history) -> Bars:
+    # Candle list from get_history or the DataFrame from get_history_df
+    if isinstance(history, list):
+        return candles_to_arrays(history)
+    out = {c: history[c].to_numpy(dtype=np.float64) for c in history.columns}
+    out["datetime"] = history.index.values.astype("datetime64[ms]").astype(np.int64)
+    return out
+
+
+def _ewm(x: np.ndarray, alpha: float) -> np.ndarray:
+    import pandas as pd
+
+    # Recursive form seeded with the first value, same as the O(1) updates
+    return pd.Series(x).ewm(alpha=alpha, adjust=False).mean().to_numpy(copy=True)
+
+
+class Indicator(ABC):
+    @abstractmethod
+    def compute(self, bars: Bars) -> np.ndarray:
+        pass
+
+    @abstractmethod
+    def update(self, candle: Candle) -> float:
+        pass
+
+
+class SMA(Indicator):
+    def __init__(self, window: int, field: str = "close"):
+        self.window = window
+        self.field = field
+        self._values = deque(maxlen=window)
+        self._sum = 0.0
+
+    def compute(self, bars: Bars) -> np.ndarray:
+        x = bars[self.field]
+        out = np.full(len(x), np.nan)
+        if len(x) >= self.window:
+            c = np.cumsum(np.r_[0.0, x])
+            out[self.window - 1 :] = (
+                c[self.window :] - c[: -self.window]
+            ) / self.window
+        self._values = deque(x[-self.window :].tolist(), maxlen=self.window)
+        self._sum = float(np.sum(x[-self.window :]))
+        return out
+
+    def update(self, candle: Candle) -> float:
+        v = float(candle[self.field])
+        if len(self._values) == self.window:
+            self._sum -= self._values[0]
+        self._values.append(v)
+        self._sum += v
+        if len(self._values) < self.window:
+            return np.nan
+        return self._sum / self.window
+
+
+class EMA(Indicator):
+    def __init__(self, span: int, field: str = "close"):
+        self.span = span
+        self.field = field
+        self.alpha = 2.0 / (span + 1)
+        self._value = None
+
+    def compute(self, bars: Bars) -> np.ndarray:
+        x = bars[self.field]
+        out = _ewm(x, self.alpha)
+        self._value = float(out[-1]) if len(out) else None
+        return out
+
+    def update(self, candle: Candle) -> float:
+        v = float(candle[self.field])
+        if self._value is None:
+            self._value = v
+        else:
+            self._value += self.alpha * (v - self._value)
+        return self._value
+
+
+class RSI(Indicator):
+    def __init__(self, period: int = 14, field: str = "close"):
+        self.period = period
+        self.field = field
+        self.alpha = 1.0 / period
+        self._count = 0
+        self._prev = None
+        self._gain = 0.0
+        self._loss = 0.0
+
+    @staticmethod
+    def _rsi(gain, loss):
+        with np.errstate(divide="ignore", invalid="ignore"):
+            rsi = 100.0 - 100.0 / (1.0 + gain / loss)
+        return np.where(loss == 0, 100.0, rsi)
+
+    def compute(self, bars: Bars) -> np.ndarray:
+        x = bars[self.field]
+        out = np.full(len(x), np.nan)
+        if len(x) > 1:
+            d = np.diff(x)
+            gain = _ewm(np.clip(d, 0, None), self.alpha)
+            loss = _ewm(np.clip(-d, 0, None), self.alpha)
+            out[1:] = self._rsi(gain, loss)
+            self._gain, self._loss = float(gain[-1]), float(loss[-1])
+        out[: self.period] = np.nan
+        self._count = len(x)
+        self._prev = float(x[-1]) if len(x) else None
+        return out
+
+    def update(self, candle: Candle) -> float:
+        v = float(candle[self.field])
+        prev, self._prev = self._prev, v
+        self._count += 1
+        if prev is None:
+            return np.nan
+        d = v - prev
+        gain, loss = max(d, 0.0), max(-d, 0.0)
+        if self._count == 2:
+            self._gain, self._loss = gain, loss
+        else:
+            self._gain += self.alpha * (gain - self._gain)
+            self._loss += self.alpha * (loss - self._loss)
+        if self._count <= self.period:
+            return np.nan
+        return float(self._rsi(np.float64(self._gain), np.float64(self._loss)))
+
+
+class ATR(Indicator):
+    def __init__(self, period: int = 14):
+        self.period = period
+        self.alpha = 1.0 / period
+        self._count = 0
+        self._prev_close = None
+        self._value = None
+
+    def compute(self, bars: Bars) -> np.ndarray:
+        high, low, close = bars["high"], bars["low"], bars["close"]
+        tr = high - low
+        if len(close) > 1:
+            pc = close[:-1]
+            tr[1:] = np.maximum.reduce(
+                [tr[1:], np.abs(high[1:] - pc), np.abs(low[1:] - pc)]
+            )
+        out = _ewm(tr, self.alpha)
+        self._value = float(out[-1]) if len(out) else None
+        out[: self.period - 1] = np.nan
+        self._count = len(close)
+        self._prev_close = float(close[-1]) if len(close) else None
+        return out
+
+    def update(self, candle: Candle) -> float:
+        high, low = float(candle["high"]), float(candle["low"])
+        tr = high - low
+        if self._prev_close is not None:
+            pc = self._prev_close
+            tr = max(tr, abs(high - pc), abs(low - pc))
+        self._prev_close = float(candle["close"])
+        if self._value is None:
+            self._value = tr
+        else:
+            self._value += self.alpha * (tr - self._value)
+        self._count += 1
+        if self._count < self.period:
+            return np.nan
+        return self._value
+
+
+class VWAP(Indicator):
+    def __init__(self, reset_daily: bool = True, tz: str = "America/New_York"):
+        self.reset_daily = reset_daily
+        self.tz = tz
+        self._session = None
+        self._pv = 0.0
+        self._volume = 0.0
+
+    def _sessions(self, ts: np.ndarray) -> np.ndarray:
+        if not self.reset_daily:
+            return np.zeros(len(ts), dtype=np.int64)
+        return local_times(ts, self.tz)[1]
+
+    def _new_session(self, ts: int) -> bool:
+        if not self.reset_daily:
+            return False
+        # Only look up the local date once the candle may be in a new session
+        if self._session is not None and 0 <= ts - self._session < SAME_SESSION_MS:
+            return False
+        session = int(self._sessions(np.array([ts]))[0])
+        if session == self._session:
+            return False
+        self._session = session
+        return True
+
+    def compute(self, bars: Bars) -> np.ndarray:
+        tp = (bars["high"] + bars["low"] + bars["close"]) / 3.0
+        v = bars["volume"]
+        pv = np.cumsum(tp * v)
+        cv = np.cumsum(v)
+        sessions = self._sessions(bars["datetime"])
+        if len(sessions):
+            # Subtract running totals as of the start of each session
+            starts = np.flatnonzero(np.r_[True, sessions[1:] != sessions[:-1]])
+            group = np.cumsum(np.r_[True, sessions[1:] != sessions[:-1]]) - 1
+            base_pv = np.r_[0.0, pv][starts][group]
+            base_cv = np.r_[0.0, cv][starts][group]
+            pv, cv = pv - base_pv, cv - base_cv
+            self._session = int(sessions[-1])
+            self._pv, self._volume = float(pv[-1]), float(cv[-1])
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return pv / cv
+
+    def update(self, candle: Candle) -> float:
+        if self._new_session(candle["datetime"]):
+            self._pv, self._volume = 0.0, 0.0
+        tp = (candle["high"] + candle["low"] + candle["close"]) / 3.0
+        self._pv += tp * candle["volume"]
+        self._volume += candle["volume"]
+        if self._volume == 0:
+            return np.nan
+        return self._pv / self._volume
+
+
+class IndicatorEngine:
+    def __init__(self, indicators: Dict[str, Indicator]):
+        self.indicators = indicators
+
+    def compute(self, history) -> Dict[str, np.ndarray]:
+        bars = history_arrays(history)
+        return {name: ind.compute(bars) for name, ind in self.indicators.items()}
+
+    def update(self, candle: Candle) -> Dict[str, float]:
+        return {name: ind.update(candle) for name, ind in self.indicators.items()}
@@ -0,0 +1,164 @@
+import re
+import time
+import string
+import bisect
+from typing import List, Dict, Set, Iterable, Optional
+
+from .entities import Instrument, InvalidArgument
+
+# One regex per leading character covers the whole symbol space in a few calls
+DEFAULT_PATTERNS = [f"{c}.*" for c in string.ascii_uppercase + string.digits] + [
+    r"\$.*"
+]
+
+_QUANTIFIERS = "*?{"
+_WORD_RE = re.compile(r"[A-Z0-9]+")
+
+
+def literal_prefix(pattern: str) -> str:
+    """Leading literal characters every match of pattern has to start with."""
+    if "|" in pattern:
+        return ""
+    prefix = []
+    for i, ch in enumerate(pattern):
+        if not ch.isalnum():
+            break
+        if i + 1 < len(pattern) and pattern[i + 1] in _QUANTIFIERS:
+            break
+        prefix.append(ch)
+    return "".join(prefix).upper()
+
+
+def covered_prefix(pattern: str) -> Optional[str]:
+    """Prefix whose symbols all match pattern, for patterns like "A.*"."""
+    if not pattern.endswith(".*"):
+        return None
+    head = pattern[:-2]
+    prefix = re.sub(r"\\(.)", r"\1", head)
+    if re.escape(prefix) != head:
+        return None
+    return prefix.upper()
+
+
+class InstrumentMaster:
+    def __init__(self, client=None, instruments: Iterable[Instrument] = ()):
+        self._client = client
+        self._by_symbol: Dict[str, Instrument] = {}
+        self._by_cusip: Dict[str, str] = {}
+        self._by_word: Dict[str, Set[str]] = {}
+        self._symbols: List[str] = []
+        self._loaded: Dict[str, float] = {}
+        self.update(instruments)
+
+    def __len__(self) -> int:
+        return len(self._by_symbol)
+
+    def __contains__(self, symbol: str) -> bool:
+        return symbol.upper() in self._by_symbol
+
+    def get(self, symbol: str) -> Optional[Instrument]:
+        return self._by_symbol.get(symbol.upper(), None)
+
+    def get_by_cusip(self, cusip: str) -> Optional[Instrument]:
+        symbol = self._by_cusip.get(cusip.upper(), None)
+        if symbol is None:
+            return None
+        return self._by_symbol[symbol]
+
+    def update(self, instruments: Iterable[Instrument]):
+        for inst in instruments:
+            self._add(inst)
+        self._symbols = sorted(self._by_symbol)
+
+    def remove(self, symbols: Iterable[str]):
+        for symbol in symbols:
+            self._remove(symbol)
+        self._symbols = sorted(self._by_symbol)
+
+    def _add(self, inst: Instrument):
+        symbol = inst.symbol.upper()
+        if symbol in self._by_symbol:
+            self._remove(symbol)
+        self._by_symbol[symbol] = inst
+        cusip = inst._get_data().get("cusip")
+        if cusip:
+            self._by_cusip[cusip.upper()] = symbol
+        for word in self._words(inst):
+            self._by_word.setdefault(word, set()).add(symbol)
+
+    def _remove(self, symbol: str):
+        inst = self._by_symbol.pop(symbol, None)
+        if inst is None:
+            return
+        cusip = inst._get_data().get("cusip")
+        if cusip and self._by_cusip.get(cusip.upper()) == symbol:
+            del self._by_cusip[cusip.upper()]
+        for word in self._words(inst):
+            symbols = self._by_word.get(word)
+            if symbols is not None:
+                symbols.discard(symbol)
+                if not symbols:
+                    del self._by_word[word]
+
+    @staticmethod
+    def _words(inst: Instrument) -> Set[str]:
+        description = inst._get_data().get("description") or ""
+        return set(_WORD_RE.findall(description.upper()))
+
+    def _prefix_range(self, prefix: str) -> List[str]:
+        lo = bisect.bisect_left(self._symbols, prefix)
+        hi = bisect.bisect_left(self._symbols, prefix + "\uffff")
+        return self._symbols[lo:hi]
+
+    def search_prefix(self, prefix: str) -> Dict[str, Instrument]:
+        return {s: self._by_symbol[s] for s in self._prefix_range(prefix.upper())}
+
+    def covers(self, symbol_pattern: str) -> bool:
+        # Only loaded patterns can be answered locally, anything else may be missing
+        if symbol_pattern in self._loaded:
+            return True
+        prefix = literal_prefix(symbol_pattern)
+        for pattern in self._loaded:
+            covered = covered_prefix(pattern)
+            if covered is not None and prefix.startswith(covered):
+                return True
+        return False
+
+    def search(self, symbol_pattern: str) -> Dict[str, Instrument]:
+        # Same semantics as the symbol-regex projection: case-insensitive full match
+        regex = re.compile(symbol_pattern, re.IGNORECASE)
+        candidates = self._prefix_range(literal_prefix(symbol_pattern))
+        return {s: self._by_symbol[s] for s in candidates if regex.fullmatch(s)}
+
+    def search_description(self, text: str) -> Dict[str, Instrument]:
+        words = _WORD_RE.findall(text.upper())
+        if not words:
+            return {}
+        # Intersect starting from the rarest word to keep the working set small
+        postings = sorted((self._by_word.get(w, set()) for w in words), key=len)
+        symbols = set(postings[0])
+        for p in postings[1:]:
+            symbols &= p
+        return {s: self._by_symbol[s] for s in sorted(symbols)}
+
+    def refresh(self, patterns: List[str] = None, max_age: float = None):
+        if self._client is None:
+            raise InvalidArgument("InstrumentMaster needs a TDClient to refresh")
+        if patterns is None:
+            patterns = DEFAULT_PATTERNS
+
+        now = time.time()
+        for pattern in patterns:
+            loaded_at = self._loaded.get(pattern)
+            if max_age is not None and loaded_at is not None:
+                if now - loaded_at < max_age:
+                    continue
+
+            fetched = self._client._search_instruments(pattern)
+            stale = set(self.search(pattern)) - set(fetched)
+            for symbol in stale:
+                self._remove(symbol)
+            for inst in fetched.values():
+                self._add(inst)
+            self._symbols = sorted(self._by_symbol)
+            self._loaded[pattern] = now
@@ -0,0 +1,149 @@
+import threading
+from datetime import date, datetime
+from typing import List, Dict, Callable, Iterable
+
+import requests
+
+from .common import map_concurrent
+from .entities import Order, OrderStateUnknown
+
+TERMINAL_STATUSES = frozenset(["FILLED", "CANCELED", "REJECTED", "EXPIRED", "REPLACED"])
+
+# Failures where the request may have reached the broker before the error
+AMBIGUOUS_ERRORS = (requests.ConnectionError, requests.Timeout, OrderStateUnknown)
+
+
+def is_ambiguous(error: Exception) -> bool:
+    # A 5xx (e.g. a gateway timeout) can come after the order was accepted,
+    # only a 4xx is a definite rejection
+    if isinstance(error, requests.HTTPError):
+        return error.response is None or error.response.status_code >= 500
+    return isinstance(error, AMBIGUOUS_ERRORS)
+
+
+_UNKNOWN = object()
+
+
+class IdempotencyGuard:
+    # One submission per key, concurrent callers with the same key share the result
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._results: Dict[str, object] = {}
+        self._in_flight: Dict[str, threading.Event] = {}
+
+    def _result(self, key: str) -> str:
+        result = self._results[key]
+        if result is _UNKNOWN:
+            raise OrderStateUnknown(
+                "Order %r may have been placed, check open orders before resubmitting"
+                % key
+            )
+        return result
+
+    def run(self, key: str, submit: Callable[[], str]) -> str:
+        while True:
+            with self._lock:
+                if key in self._results:
+                    return self._result(key)
+                event = self._in_flight.get(key)
+                if event is None:
+                    event = self._in_flight[key] = threading.Event()
+                    break
+            event.wait()
+
+        outcome = None
+        try:
+            result = submit()
+            outcome = result
+            return result
+        except Exception as e:
+            # Never resend blindly, the first attempt may already be working
+            if is_ambiguous(e):
+                outcome = _UNKNOWN
+            raise
+        finally:
+            # Any other failure is definite and leaves the key free to resubmit
+            with self._lock:
+                if outcome is not None:
+                    self._results[key] = outcome
+                del self._in_flight[key]
+            event.set()
+
+    def forget(self, key: str):
+        # e.g. after confirming an unknown order was never placed
+        with self._lock:
+            self._results.pop(key, None)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._results
+
+
+class OrderTracker:
+    # Above this many open orders one list call is cheaper than per-order requests
+    bulk_threshold = 10
+
+    def __init__(self, client, account_id: str, max_workers: int = 4):
+        self._client = client
+        self.account_id = account_id
+        self.max_workers = max_workers
+        self._status: Dict[str, str] = {}
+        self._orders: Dict[str, Order] = {}
+        self._entered: Dict[str, date] = {}
+
+    @property
+    def open_orders(self) -> List[str]:
+        return list(self._status)
+
+    def track(self, order_ids: Iterable[str], entered: date = None):
+        if isinstance(order_ids, str):
+            order_ids = [order_ids]
+        for order_id in order_ids:
+            order_id = str(order_id)
+            self._status.setdefault(order_id, None)
+            if entered is not None:
+                self._entered.setdefault(order_id, entered)
+
+    def untrack(self, order_id: str):
+        self._status.pop(str(order_id), None)
+        self._entered.pop(str(order_id), None)
+
+    def _get_order(self, order_id: str) -> Order:
+        return self._client.get_order(self.account_id, order_id)
+
+    def get(self, order_id: str) -> Order:
+        return self._orders.get(str(order_id))
+
+    def _fetch(self, order_ids: List[str]) -> List[Order]:
+        missing = order_ids
+        orders = []
+        if len(order_ids) > self.bulk_threshold:
+            # Bounded by the oldest tracked order, not the default lookback
+            known = [self._entered[i] for i in order_ids if i in self._entered]
+            from_entered = min(known) if known else None
+            orders = self._client.get_orders(self.account_id, from_entered=from_entered)
+            found = {str(o.orderId) for o in orders}
+            # e.g. old GTC orders outside the window, asked for one by one
+            missing = [i for i in order_ids if i not in found]
+        orders.extend(map_concurrent(self._get_order, missing, self.max_workers))
+        return orders
+
+    def poll(self) -> List[Order]:
+        # Only orders that can still change are requested, returns the ones that did
+        changed = []
+        for order in self._fetch(self.open_orders):
+            order_id = str(order.orderId)
+            if order_id not in self._status:
+                continue
+            self._orders[order_id] = order
+            entered = order._get_data().get("enteredTime")
+            if entered:
+                self._entered[order_id] = datetime.strptime(
+                    entered[:10], "%Y-%m-%d"
+                ).date()
+            if order.status != self._status[order_id]:
+                self._status[order_id] = order.status
+                changed.append(order)
+            if order.status in TERMINAL_STATUSES:
+                del self._status[order_id]
+                self._entered.pop(order_id, None)
+        return changed
@@ -0,0 +1,139 @@
+import time
+import logging
+import threading
+from typing import List, Dict, Callable
+
+import attr
+import numpy as np
+
+from .common import unique
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_FIELDS = [
+    "bidPrice",
+    "askPrice",
+    "lastPrice",
+    "bidSize",
+    "askSize",
+    "lastSize",
+    "totalVolume",
+    "mark",
+    "netChange",
+]
+
+Delta = Dict[str, Dict[str, float]]
+
+
+@attr.s
+class PollStats:
+    cycles: int = attr.ib(default=0)
+    errors: int = attr.ib(default=0)
+    fetch_seconds: float = attr.ib(default=0.0)
+    diff_seconds: float = attr.ib(default=0.0)
+    changed_symbols: int = attr.ib(default=0)
+    changed_fields: int = attr.ib(default=0)
+
+
+class QuotePoller:
+    def __init__(
+        self,
+        client,
+        symbols: List[str],
+        fields: List[str] = None,
+        interval: float = 1.0,
+        calendar=None,
+        outside_rth: bool = False,
+    ):
+        self._client = client
+        self.symbols = unique(s.upper() for s in symbols)
+        self.fields = list(fields or DEFAULT_FIELDS)
+        self.interval = interval
+        self.calendar = calendar
+        self.outside_rth = outside_rth
+        self.stats = PollStats()
+
+        self._index = {s: i for i, s in enumerate(self.symbols)}
+        self._last = np.full((len(self.symbols), len(self.fields)), np.nan)
+        self._subscribers: List[Callable[[Delta], None]] = []
+        self._stop = threading.Event()
+        self._thread = None
+
+    def subscribe(self, callback: Callable[[Delta], None]):
+        self._subscribers.append(callback)
+
+    def unsubscribe(self, callback: Callable[[Delta], None]):
+        self._subscribers.remove(callback)
+
+    def snapshot(self) -> np.ndarray:
+        return self._last.copy()
+
+    def _fetch(self) -> np.ndarray:
+        table = self._client.quotes_table(self.symbols, self.fields)
+        return table.reindex(self.symbols)
+
+    def _diff(self, snap: np.ndarray) -> Delta:
+        changed = snap != self._last
+        # NaN != NaN, a field missing in both snapshots has not changed
+        changed &= ~(np.isnan(snap) & np.isnan(self._last))
+        delta: Delta = {}
+        rows, cols = np.nonzero(changed)
+        values = snap[rows, cols].tolist()
+        for r, c, v in zip(rows.tolist(), cols.tolist(), values):
+            delta.setdefault(self.symbols[r], {})[self.fields[c]] = v
+        return delta
+
+    def poll_once(self) -> Delta:
+        t0 = time.perf_counter()
+        snap = self._fetch()
+        t1 = time.perf_counter()
+        delta = self._diff(snap)
+        self._last = snap
+        t2 = time.perf_counter()
+
+        self.stats.cycles += 1
+        self.stats.fetch_seconds = t1 - t0
+        self.stats.diff_seconds = t2 - t1
+        self.stats.changed_symbols = len(delta)
+        self.stats.changed_fields = sum(len(v) for v in delta.values())
+
+        if delta:
+            for callback in list(self._subscribers):
+                callback(delta)
+        return delta
+
+    def next_delay(self) -> float:
+        if self.calendar is None:
+            return self.interval
+        return self.calendar.poll_delay(self.interval, outside_rth=self.outside_rth)
+
+    def _run(self):
+        while not self._stop.is_set():
+            started = time.monotonic()
+            try:
+                self.poll_once()
+            except Exception:
+                self.stats.errors += 1
+                logger.exception("Quote poll failed")
+            try:
+                delay = self.next_delay()
+            except Exception:
+                # Calendar lookups hit the network, keep polling at the base interval
+                self.stats.errors += 1
+                logger.exception("Poll delay lookup failed")
+                delay = self.interval
+            elapsed = time.monotonic() - started
+            self._stop.wait(max(0.0, delay - elapsed))
+
+    def start(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = None):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
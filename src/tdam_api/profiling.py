@@ -0,0 +1,189 @@
+import os
+import sys
+import json
+import time
+import threading
+import tracemalloc
+from collections import deque
+from typing import List, Dict, Deque
+
+import attr
+
+# Per-thread CPU time where available (3.7+), process CPU time otherwise
+_cpu_time = getattr(time, "thread_time", time.process_time)
+
+
+@attr.s(frozen=True)
+class Span:
+    name: str = attr.ib()
+    start: float = attr.ib()
+    wall: float = attr.ib()
+    cpu: float = attr.ib()
+    # Net change of allocated blocks, interpreter wide
+    blocks: int = attr.ib()
+    # Net change of traced bytes, 0 unless tracemalloc is tracing
+    bytes: int = attr.ib()
+    thread: int = attr.ib()
+    depth: int = attr.ib()
+
+
+@attr.s
+class SpanStats:
+    count: int = attr.ib(default=0)
+    wall: float = attr.ib(default=0.0)
+    cpu: float = attr.ib(default=0.0)
+    max_wall: float = attr.ib(default=0.0)
+    blocks: int = attr.ib(default=0)
+    bytes: int = attr.ib(default=0)
+
+    def add(self, span: Span):
+        self.count += 1
+        self.wall += span.wall
+        self.cpu += span.cpu
+        self.max_wall = max(self.max_wall, span.wall)
+        self.blocks += span.blocks
+        self.bytes += span.bytes
+
+
+class _SpanContext:
+    __slots__ = ("_profiler", "_name", "_start", "_cpu", "_blocks", "_bytes")
+
+    def __init__(self, profiler: "Profiler", name: str):
+        self._profiler = profiler
+        self._name = name
+
+    def __enter__(self):
+        self._profiler._depth(1)
+        self._bytes = tracemalloc.get_traced_memory()[0]
+        self._blocks = sys.getallocatedblocks()
+        self._cpu = _cpu_time()
+        self._start = time.perf_counter()
+
+    def __exit__(self, *exc):
+        wall = time.perf_counter() - self._start
+        cpu = _cpu_time() - self._cpu
+        blocks = sys.getallocatedblocks() - self._blocks
+        nbytes = tracemalloc.get_traced_memory()[0] - self._bytes
+        depth = self._profiler._depth(-1)
+        self._profiler._record(
+            Span(
+                self._name,
+                self._start,
+                wall,
+                cpu,
+                blocks,
+                nbytes,
+                threading.get_ident(),
+                depth,
+            )
+        )
+
+
+class _NullSpan:
+    def __enter__(self):
+        pass
+
+    def __exit__(self, *exc):
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class NullProfiler:
+    # Used while profiling is off, span() costs one method call
+    enabled = False
+
+    def span(self, name: str) -> _NullSpan:
+        return _NULL_SPAN
+
+    def stop(self):
+        pass
+
+
+class Profiler:
+    enabled = True
+
+    def __init__(self, trace_memory: bool = False, max_spans: int = 100000):
+        # Only the latest max_spans are kept for the trace, stats cover everything
+        self.trace_memory = trace_memory
+        self._spans: Deque[Span] = deque(maxlen=max_spans)
+        self._stats: Dict[str, SpanStats] = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._origin = time.perf_counter()
+        # Tracing the caller started themselves is left running on stop()
+        self._started_tracemalloc = trace_memory and not tracemalloc.is_tracing()
+        if self._started_tracemalloc:
+            tracemalloc.start()
+
+    def span(self, name: str) -> _SpanContext:
+        return _SpanContext(self, name)
+
+    def _depth(self, step: int) -> int:
+        depth = getattr(self._local, "depth", 0)
+        self._local.depth = depth + step
+        return min(depth, depth + step)
+
+    def _record(self, span: Span):
+        with self._lock:
+            self._spans.append(span)
+            stats = self._stats.get(span.name)
+            if stats is None:
+                stats = self._stats[span.name] = SpanStats()
+            stats.add(span)
+
+    @property
+    def spans(self) -> List[Span]:
+        with self._lock:
+            return list(self._spans)
+
+    def stats(self) -> Dict[str, SpanStats]:
+        with self._lock:
+            return {k: attr.evolve(v) for k, v in self._stats.items()}
+
+    def reset(self):
+        with self._lock:
+            self._spans.clear()
+            self._stats.clear()
+
+    def stop(self):
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+
+    def report(self) -> str:
+        lines = [
+            f"{'span':40s} {'calls':>7s} {'wall ms':>10s} {'mean ms':>9s} "
+            f"{'max ms':>9s} {'cpu ms':>10s} {'blocks':>9s} {'kB':>9s}"
+        ]
+        ordered = sorted(self.stats().items(), key=lambda kv: -kv[1].wall)
+        for name, s in ordered:
+            lines.append(
+                f"{name:40s} {s.count:7d} {s.wall * 1e3:10.2f} "
+                f"{s.wall / s.count * 1e3:9.3f} {s.max_wall * 1e3:9.3f} "
+                f"{s.cpu * 1e3:10.2f} {s.blocks:9d} {s.bytes / 1024:9.1f}"
+            )
+        return "\n".join(lines)
+
+    def chrome_trace(self) -> dict:
+        # Trace Event Format, loads in chrome://tracing and Perfetto
+        pid = os.getpid()
+        events = [
+            {
+                "name": s.name,
+                "cat": s.name.split(".", 1)[0],
+                "ph": "X",
+                "ts": (s.start - self._origin) * 1e6,
+                "dur": s.wall * 1e6,
+                "pid": pid,
+                "tid": s.thread,
+                "args": {"cpu_ms": s.cpu * 1e3, "blocks": s.blocks, "bytes": s.bytes},
+            }
+            for s in self.spans
+        ]
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def write_chrome_trace(self, path: str):
+        with open(path, "w") as f:
+            json.dump(self.chrome_trace(), f)
@@ -0,0 +1,233 @@
+import os
+import mmap
+import time
+import tempfile
+from typing import List, Dict, Tuple
+
+import numpy as np
+
+from .entities import InvalidArgument
+from .poller import QuotePoller, Delta
+
+MAGIC = b"TDQBOARD"
+HEADER_SIZE = 64
+# Minimum name slot widths, widened to the longest name on the board
+FIELD_NAME_SIZE = 32
+SYMBOL_SIZE = 16
+# Readers wait out a publish in progress for up to READ_TIMEOUT seconds
+READ_TIMEOUT = 1.0
+READ_BACKOFF = 0.0001
+
+# Header: magic, n_symbols (u4), n_fields (u4), seq (u8), updated_at (f8),
+# symbol_size (u4), field_size (u4)
+_HEADER = np.dtype(
+    [
+        ("magic", "S8"),
+        ("n_symbols", "<u4"),
+        ("n_fields", "<u4"),
+        ("seq", "<u8"),
+        ("updated_at", "<f8"),
+        ("symbol_size", "<u4"),
+        ("field_size", "<u4"),
+    ]
+)
+
+
+def _default_path() -> str:
+    directory = "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir()
+    return os.path.join(directory, f"tdam_quoteboard_{os.getpid()}")
+
+
+def _slot_size(names: List[bytes], minimum: int) -> int:
+    # Rounded up to 8 bytes so the value block stays aligned
+    longest = max([minimum] + [len(n) for n in names])
+    return (longest + 7) // 8 * 8
+
+
+class _Layout:
+    def __init__(
+        self, buf, n_symbols: int, n_fields: int, symbol_size: int, field_size: int
+    ):
+        offset = 0
+        self.header = np.frombuffer(buf, _HEADER, 1, offset)
+        offset += HEADER_SIZE
+        self.fields = np.frombuffer(buf, f"S{field_size}", n_fields, offset)
+        offset += field_size * n_fields
+        self.symbols = np.frombuffer(buf, f"S{symbol_size}", n_symbols, offset)
+        offset += symbol_size * n_symbols
+        self.row_seq = np.frombuffer(buf, "<u8", n_symbols, offset)
+        offset += 8 * n_symbols
+        self.values = np.frombuffer(buf, "<f8", n_symbols * n_fields, offset).reshape(
+            n_symbols, n_fields
+        )
+
+    @staticmethod
+    def size(n_symbols: int, n_fields: int, symbol_size: int, field_size: int) -> int:
+        return (
+            HEADER_SIZE
+            + field_size * n_fields
+            + (symbol_size + 8) * n_symbols
+            + 8 * n_symbols * n_fields
+        )
+
+
+class QuoteBoardPublisher:
+    def __init__(
+        self,
+        client,
+        symbols: List[str],
+        fields: List[str] = None,
+        path: str = None,
+        interval: float = 1.0,
+        calendar=None,
+        outside_rth: bool = False,
+    ):
+        self.poller = QuotePoller(
+            client,
+            symbols,
+            fields=fields,
+            interval=interval,
+            calendar=calendar,
+            outside_rth=outside_rth,
+        )
+        self.symbols = self.poller.symbols
+        self.fields = self.poller.fields
+        self._index = {s: i for i, s in enumerate(self.symbols)}
+        self.path = path or _default_path()
+
+        symbols = [x.encode() for x in self.symbols]
+        fields = [x.encode() for x in self.fields]
+        # numpy silently truncates names longer than their slot
+        symbol_size = _slot_size(symbols, SYMBOL_SIZE)
+        field_size = _slot_size(fields, FIELD_NAME_SIZE)
+
+        n, f = len(self.symbols), len(self.fields)
+        size = _Layout.size(n, f, symbol_size, field_size)
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            os.ftruncate(fd, size)
+            self._mm = mmap.mmap(fd, size)
+        finally:
+            os.close(fd)
+
+        self._layout = _Layout(self._mm, n, f, symbol_size, field_size)
+        self._layout.fields[:] = fields
+        self._layout.symbols[:] = symbols
+        self._layout.values[:] = np.nan
+        header = self._layout.header
+        header["n_symbols"] = n
+        header["n_fields"] = f
+        header["symbol_size"] = symbol_size
+        header["field_size"] = field_size
+        header["seq"] = 0
+        # Magic goes last so readers never see a half initialised board
+        header["magic"] = MAGIC
+
+        self.poller.subscribe(self.publish)
+
+    @property
+    def sequence(self) -> int:
+        return int(self._layout.header["seq"][0])
+
+    def publish(self, delta: Delta) -> int:
+        layout = self._layout
+        header = layout.header
+        # The poller's latest snapshot already holds every change in the delta
+        values = self.poller._last
+        rows = [self._index[s] for s in delta if s in self._index]
+        # Seqlock: an odd sequence tells readers a write is in progress, keep it
+        # short with one vectorized copy
+        seq = int(header["seq"][0]) + 1
+        header["seq"] = seq
+        np.copyto(layout.values, values)
+        layout.row_seq[rows] = seq + 1
+        header["updated_at"] = time.time()
+        header["seq"] = seq + 1
+        return seq + 1
+
+    def poll_once(self) -> Delta:
+        return self.poller.poll_once()
+
+    def start(self):
+        self.poller.start()
+
+    def stop(self, timeout: float = None):
+        self.poller.stop(timeout)
+
+    def close(self, unlink: bool = True):
+        self.stop()
+        self._layout = None
+        self._mm.close()
+        if unlink and os.path.exists(self.path):
+            os.unlink(self.path)
+
+
+class QuoteBoardReader:
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        header = np.frombuffer(self._mm, _HEADER, 1, 0)
+        if header["magic"][0] != MAGIC:
+            del header
+            self._mm.close()
+            raise InvalidArgument(f"{path} is not an initialised quote board")
+        self._layout = _Layout(
+            self._mm,
+            int(header["n_symbols"][0]),
+            int(header["n_fields"][0]),
+            int(header["symbol_size"][0]),
+            int(header["field_size"][0]),
+        )
+        del header
+        self.fields = [x.decode() for x in self._layout.fields]
+        self.symbols = [x.decode() for x in self._layout.symbols]
+        self._index = {s: i for i, s in enumerate(self.symbols)}
+
+    @property
+    def sequence(self) -> int:
+        return int(self._layout.header["seq"][0])
+
+    @property
+    def updated_at(self) -> float:
+        return float(self._layout.header["updated_at"][0])
+
+    def view(self) -> np.ndarray:
+        # Zero copy and read only, may be torn if read during a publish
+        return self._layout.values
+
+    def snapshot(
+        self, out: np.ndarray = None, timeout: float = READ_TIMEOUT
+    ) -> Tuple[int, np.ndarray]:
+        values = self._layout.values
+        if out is None:
+            out = np.empty_like(values)
+        return self._read(values, out, timeout), out
+
+    def _read(self, src: np.ndarray, out: np.ndarray, timeout: float) -> int:
+        seq = self._layout.header["seq"]
+        deadline = time.monotonic() + timeout
+        while True:
+            before = int(seq[0])
+            if not before % 2:
+                np.copyto(out, src)
+                if int(seq[0]) == before:
+                    return before
+            if time.monotonic() > deadline:
+                raise TimeoutError("Quote board kept changing during read")
+            # Let the writer finish instead of spinning against it
+            time.sleep(READ_BACKOFF)
+
+    def changed_since(self, seq: int) -> List[str]:
+        rows = np.flatnonzero(self._layout.row_seq > seq)
+        return [self.symbols[r] for r in rows]
+
+    def get(self, symbol: str) -> Dict[str, float]:
+        src = self._layout.values[self._index[symbol.upper()]]
+        out = np.empty_like(src)
+        self._read(src, out, READ_TIMEOUT)
+        return dict(zip(self.fields, out.tolist()))
+
+    def close(self):
+        self._layout = None
+        self._mm.close()
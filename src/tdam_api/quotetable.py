@@ -0,0 +1,97 @@
+from typing import List, Dict, Any, Union
+
+import numpy as np
+
+from .common import number
+from .entities import InvalidArgument
+
+_CASTABLE = {int, float, type(None)}
+
+NUMERIC_FIELDS = [
+    "bidPrice",
+    "askPrice",
+    "lastPrice",
+    "mark",
+    "bidSize",
+    "askSize",
+    "lastSize",
+    "openPrice",
+    "highPrice",
+    "lowPrice",
+    "closePrice",
+    "netChange",
+    "totalVolume",
+    "quoteTimeInLong",
+    "tradeTimeInLong",
+    "52WkHigh",
+    "52WkLow",
+]
+
+
+class QuoteTable:
+    def __init__(self, symbols: List[str], fields: List[str], values: np.ndarray):
+        if values.shape != (len(symbols), len(fields)):
+            raise InvalidArgument("values should be shaped (symbols, fields)")
+        self.symbols = list(symbols)
+        self.fields = list(fields)
+        # Column major so every field is a contiguous column
+        self.values = np.asfortranarray(values, dtype=np.float64)
+        self._index = {s: i for i, s in enumerate(self.symbols)}
+        self._field_index = {f: i for i, f in enumerate(self.fields)}
+
+    @classmethod
+    def from_response(
+        cls, output: Dict[str, Dict[str, Any]], fields: List[str] = None
+    ) -> "QuoteTable":
+        fields = list(fields or NUMERIC_FIELDS)
+        rows = list(output.values())
+        values = np.empty((len(rows), len(fields)), order="F")
+        for j, f in enumerate(fields):
+            column = [r.get(f) for r in rows]
+            # None becomes NaN, anything non numeric (flags, strings) too. The
+            # float cast would turn True into 1.0 and "12.5" into 12.5, so it
+            # only takes columns of plain numbers.
+            if {type(v) for v in column} <= _CASTABLE:
+                values[:, j] = np.array(column, dtype=np.float64)
+            else:
+                values[:, j] = [number(v) for v in column]
+        return cls(list(output.keys()), fields, values)
+
+    def __len__(self) -> int:
+        return len(self.symbols)
+
+    def __contains__(self, symbol: str) -> bool:
+        return symbol in self._index
+
+    def __getitem__(self, field: str) -> np.ndarray:
+        return self.values[:, self._field_index[field]]
+
+    def row(self, symbol: str) -> Dict[str, float]:
+        return dict(zip(self.fields, self.values[self._index[symbol]].tolist()))
+
+    def filter(self, mask: Union[np.ndarray, List[bool]]) -> "QuoteTable":
+        mask = np.asarray(mask, dtype=bool)
+        symbols = [s for s, keep in zip(self.symbols, mask.tolist()) if keep]
+        return QuoteTable(symbols, self.fields, self.values[mask])
+
+    def sort(self, by: str, descending: bool = False) -> "QuoteTable":
+        column = self[by]
+        # NaNs go last either way
+        order = np.argsort(-column if descending else column, kind="stable")
+        return QuoteTable(
+            [self.symbols[i] for i in order], self.fields, self.values[order]
+        )
+
+    def reindex(self, symbols: List[str]) -> np.ndarray:
+        out = np.full((len(symbols), len(self.fields)), np.nan)
+        pairs = [(i, self._index[s]) for i, s in enumerate(symbols) if s in self._index]
+        if pairs:
+            dst, src = zip(*pairs)
+            out[list(dst)] = self.values[list(src)]
+        return out
+
+    def to_pandas(self):
+        import pandas as pd
+
+        index = pd.Index(self.symbols, name="symbol")
+        return pd.DataFrame(self.values, index=index, columns=self.fields, copy=False)
@@ -0,0 +1,255 @@
+import os
+import json
+import time
+from typing import List, Dict, Tuple
+
+import numpy as np
+
+from .common import number
+from .entities import OptionChain, InvalidArgument
+
+DEFAULT_FIELDS = [
+    "bid",
+    "ask",
+    "last",
+    "mark",
+    "bidSize",
+    "askSize",
+    "lastSize",
+    "totalVolume",
+    "openInterest",
+    "volatility",
+    "delta",
+    "gamma",
+    "theta",
+    "vega",
+    "rho",
+    "theoreticalOptionValue",
+    "quoteTimeInLong",
+    "tradeTimeInLong",
+]
+
+# One row per snapshot, end is the number of delta records once it is applied
+SNAPSHOT_DTYPE = np.dtype([("timestamp", "<i8"), ("end", "<i8"), ("keyframe", "<i8")])
+DELTA_DTYPE = np.dtype(
+    [("contract", "<u4"), ("field", "<u2"), ("_pad", "<u2"), ("value", "<f8")]
+)
+
+META_FILE = "meta.json"
+CONTRACTS_FILE = "contracts.txt"
+SNAPSHOTS_FILE = "snapshots.bin"
+DELTAS_FILE = "deltas.bin"
+
+
+def log_path(root: str, symbol: str, expiry: str) -> str:
+    return os.path.join(root, f"{symbol.upper()}_{expiry}")
+
+
+def _map(path: str, dtype: np.dtype) -> np.ndarray:
+    size = os.path.getsize(path) if os.path.exists(path) else 0
+    count = size // dtype.itemsize
+    if count == 0:
+        return np.empty(0, dtype)
+    return np.memmap(path, dtype=dtype, mode="r", shape=(count,))
+
+
+class ChainLog:
+    def __init__(self, path: str):
+        self.path = path
+        with open(os.path.join(path, META_FILE)) as f:
+            meta = json.load(f)
+        self.symbol = meta["symbol"]
+        self.expiry = meta["expiry"]
+        self.fields: List[str] = meta["fields"]
+        self._field_index = {f: i for i, f in enumerate(self.fields)}
+        self.reload()
+
+    def reload(self):
+        self._snapshots = _map(os.path.join(self.path, SNAPSHOTS_FILE), SNAPSHOT_DTYPE)
+        self._deltas = _map(os.path.join(self.path, DELTAS_FILE), DELTA_DTYPE)
+        with open(os.path.join(self.path, CONTRACTS_FILE)) as f:
+            self.contracts: List[str] = f.read().split()
+        self._contract_index = {c: i for i, c in enumerate(self.contracts)}
+
+    def __len__(self) -> int:
+        return len(self._snapshots)
+
+    @property
+    def timestamps(self) -> np.ndarray:
+        return self._snapshots["timestamp"]
+
+    def _start(self, snapshot: int) -> int:
+        # First delta record of a snapshot
+        return int(self._snapshots["end"][snapshot - 1]) if snapshot > 0 else 0
+
+    def _keyframe_before(self, snapshot: int) -> int:
+        keyframes = np.flatnonzero(self._snapshots["keyframe"][: snapshot + 1])
+        return int(keyframes[-1]) if len(keyframes) else 0
+
+    def _snapshot_at(self, timestamp: int) -> int:
+        return int(np.searchsorted(self.timestamps, timestamp, side="right")) - 1
+
+    def values_at(self, timestamp: int) -> np.ndarray:
+        n_fields = len(self.fields)
+        out = np.full((len(self.contracts), n_fields), np.nan)
+        snapshot = self._snapshot_at(timestamp)
+        if snapshot < 0:
+            return out
+        lo = self._start(self._keyframe_before(snapshot))
+        hi = int(self._snapshots["end"][snapshot])
+        records = self._deltas[lo:hi]
+        keys = records["contract"].astype(np.int64) * n_fields + records["field"]
+        # Last write per (contract, field) wins
+        rev_keys = keys[::-1]
+        uniq, first = np.unique(rev_keys, return_index=True)
+        out.reshape(-1)[uniq] = records["value"][::-1][first]
+        return out
+
+    def as_of(self, timestamp: int) -> Dict[str, Dict[str, float]]:
+        values = self.values_at(timestamp)
+        live = ~np.isnan(values).all(axis=1)
+        return {
+            self.contracts[i]: dict(zip(self.fields, values[i].tolist()))
+            for i in np.flatnonzero(live)
+        }
+
+    def history(
+        self, contract: str, start: int = None, end: int = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        if contract not in self._contract_index:
+            raise InvalidArgument(f"{contract} is not in this log")
+        cid = self._contract_index[contract]
+        timestamps = self.timestamps
+        first = 0 if start is None else int(np.searchsorted(timestamps, start))
+        last = len(timestamps) if end is None else self._snapshot_at(end) + 1
+        if last <= first:
+            return timestamps[:0].copy(), np.empty((0, len(self.fields)))
+
+        base = self._keyframe_before(first)
+        lo = self._start(base)
+        hi = int(self._snapshots["end"][last - 1])
+        records = self._deltas[lo:hi]
+        positions = np.flatnonzero(records["contract"] == cid)
+        mine = records[positions]
+        # Snapshot (relative to base) each record belongs to
+        ends = self._snapshots["end"][base:last]
+        rows = np.searchsorted(ends, positions + lo, side="right")
+
+        n_rows = last - base
+        n_fields = len(self.fields)
+        values = np.full((n_rows, n_fields), np.nan)
+        written = np.zeros((n_rows, n_fields), dtype=bool)
+        values[rows, mine["field"]] = mine["value"]
+        written[rows, mine["field"]] = True
+
+        # Forward fill every field from the last snapshot that wrote it
+        idx = np.where(written, np.arange(n_rows)[:, None], 0)
+        np.maximum.accumulate(idx, axis=0, out=idx)
+        filled = values[idx, np.arange(n_fields)]
+        offset = first - base
+        return np.array(timestamps[first:last]), filled[offset:]
+
+
+class ChainRecorder:
+    def __init__(
+        self,
+        root: str,
+        symbol: str,
+        expiry: str,
+        fields: List[str] = None,
+        keyframe_interval: int = 100,
+    ):
+        self.path = log_path(root, symbol, expiry)
+        self.keyframe_interval = keyframe_interval
+        meta_path = os.path.join(self.path, META_FILE)
+        if not os.path.exists(meta_path):
+            os.makedirs(self.path, exist_ok=True)
+            meta = {
+                "symbol": symbol.upper(),
+                "expiry": expiry,
+                "fields": list(fields or DEFAULT_FIELDS),
+            }
+            with open(meta_path, "w") as f:
+                json.dump(meta, f)
+            open(os.path.join(self.path, CONTRACTS_FILE), "a").close()
+
+        # Drop deltas of an append that never got its snapshot row written
+        snapshots = _map(os.path.join(self.path, SNAPSHOTS_FILE), SNAPSHOT_DTYPE)
+        self._deltas_end = int(snapshots["end"][-1]) if len(snapshots) else 0
+        del snapshots
+        with open(os.path.join(self.path, DELTAS_FILE), "ab") as f:
+            f.truncate(self._deltas_end * DELTA_DTYPE.itemsize)
+
+        self.log = ChainLog(self.path)
+        if fields is not None and list(fields) != self.log.fields:
+            raise InvalidArgument("fields do not match the existing log")
+        self.fields = self.log.fields
+        self._contract_index = dict(self.log._contract_index)
+        self._contracts = list(self.log.contracts)
+        self._last = self.log.values_at(np.iinfo(np.int64).max)
+        self._count = len(self.log)
+        self._last_timestamp = (
+            int(self.log.timestamps[-1]) if self._count else np.iinfo(np.int64).min
+        )
+
+    def _contract_id(self, contract: str, new: List[str]) -> int:
+        cid = self._contract_index.get(contract)
+        if cid is None:
+            cid = len(self._contracts)
+            self._contract_index[contract] = cid
+            self._contracts.append(contract)
+            new.append(contract)
+        return cid
+
+    def append(self, chain: OptionChain, timestamp: int = None) -> int:
+        if timestamp is None:
+            timestamp = int(time.time() * 1000)
+        if timestamp < self._last_timestamp:
+            raise InvalidArgument("Snapshots have to be appended in time order")
+
+        new: List[str] = []
+        rows = {}
+        for option in chain.options():
+            data = option._get_data()
+            cid = self._contract_id(data["symbol"], new)
+            rows[cid] = [number(data.get(f)) for f in self.fields]
+
+        current = np.full((len(self._contracts), len(self.fields)), np.nan)
+        if rows:
+            current[list(rows)] = list(rows.values())
+        previous = np.full_like(current, np.nan)
+        previous[: len(self._last)] = self._last
+
+        keyframe = self._count % self.keyframe_interval == 0
+        if keyframe:
+            changed = ~np.isnan(current)
+        else:
+            changed = current != previous
+            changed &= ~(np.isnan(current) & np.isnan(previous))
+        contracts, fields = np.nonzero(changed)
+
+        records = np.zeros(len(contracts), DELTA_DTYPE)
+        records["contract"] = contracts
+        records["field"] = fields
+        records["value"] = current[contracts, fields]
+
+        end = self._deltas_end + len(records)
+        snapshot = np.array([(timestamp, end, keyframe)], SNAPSHOT_DTYPE)
+        # The snapshot row goes last, it is what makes the deltas visible
+        with open(os.path.join(self.path, DELTAS_FILE), "ab") as f:
+            f.write(records.tobytes())
+        if new:
+            with open(os.path.join(self.path, CONTRACTS_FILE), "a") as f:
+                f.write("".join(c + "\n" for c in new))
+        with open(os.path.join(self.path, SNAPSHOTS_FILE), "ab") as f:
+            f.write(snapshot.tobytes())
+
+        self._last = current
+        self._count += 1
+        self._deltas_end = end
+        self._last_timestamp = timestamp
+        return len(records)
+
+    def reader(self) -> ChainLog:
+        self.log.reload()
+        return self.log
@@ -0,0 +1,158 @@
+from typing import List, Dict, Optional
+
+import numpy as np
+
+from .entities import InvalidArgument
+
+MINUTE_MS = 60 * 1000
+FREQ_MINUTES = {"1min": 1, "5min": 5, "10min": 10, "15min": 15, "30min": 30}
+RESAMPLE_FREQS = list(FREQ_MINUTES) + ["d"]
+PRICE_FIELDS = ["open", "high", "low", "close", "volume"]
+
+# Regular trading hours in exchange local minutes since midnight
+RTH_OPEN = 9 * 60 + 30
+RTH_CLOSE = 16 * 60
+
+Bars = Dict[str, np.ndarray]
+
+
+def candles_to_arrays(candles: List[Dict[str, float]]) -> Bars:
+    out = {f: np.array([c[f] for c in candles], dtype=np.float64) for f in PRICE_FIELDS}
+    out["datetime"] = np.array([c["datetime"] for c in candles], dtype=np.int64)
+    return out
+
+
+def arrays_to_candles(bars: Bars) -> List[Dict[str, float]]:
+    columns = [bars[f].tolist() for f in PRICE_FIELDS + ["datetime"]]
+    keys = PRICE_FIELDS + ["datetime"]
+    return [dict(zip(keys, row)) for row in zip(*columns)]
+
+
+def local_times(ts: np.ndarray, tz: str):
+    import pandas as pd
+
+    local = pd.to_datetime(ts, unit="ms", utc=True).tz_convert(tz)
+    minute_of_day = np.asarray(local.hour * 60 + local.minute)
+    epoch = pd.Timestamp(0, tz="UTC")
+    midnight_ms = np.asarray(
+        (local.normalize() - epoch) // pd.Timedelta(milliseconds=1)
+    )
+    return minute_of_day, midnight_ms
+
+
+def _keys(bars: Bars, freq: str, outside_rth: bool, tz: str):
+    ts = bars["datetime"]
+    mask = None
+    midnight_ms = None
+    if not outside_rth or freq == "d":
+        minute_of_day, midnight_ms = local_times(ts, tz)
+        if not outside_rth:
+            mask = (minute_of_day >= RTH_OPEN) & (minute_of_day < RTH_CLOSE)
+
+    if freq == "d":
+        keys = midnight_ms
+    else:
+        period = FREQ_MINUTES[freq] * MINUTE_MS
+        # Exchange offsets are whole hours so UTC buckets line up with local ones
+        keys = ts - ts % period
+
+    if mask is not None:
+        bars = {k: v[mask] for k, v in bars.items()}
+        keys = keys[mask]
+    return bars, keys
+
+
+def _aggregate(bars: Bars, keys: np.ndarray) -> Bars:
+    n = len(keys)
+    if n == 0:
+        return {k: v[:0] for k, v in bars.items()}
+    starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])
+    ends = np.r_[starts[1:], n] - 1
+    return {
+        "open": bars["open"][starts],
+        "high": np.maximum.reduceat(bars["high"], starts),
+        "low": np.minimum.reduceat(bars["low"], starts),
+        "close": bars["close"][ends],
+        "volume": np.add.reduceat(bars["volume"], starts),
+        "datetime": keys[starts],
+    }
+
+
+def _check_freq(freq: str):
+    if freq not in RESAMPLE_FREQS:
+        raise InvalidArgument(f"Frequency should be one of {', '.join(RESAMPLE_FREQS)}")
+
+
+def _sorted(candles: List[Dict[str, float]]) -> Bars:
+    # _aggregate relies on time order for open and close
+    bars = candles_to_arrays(candles)
+    order = np.argsort(bars["datetime"], kind="stable")
+    return {k: v[order] for k, v in bars.items()}
+
+
+def resample(
+    candles: List[Dict[str, float]],
+    freq: str,
+    outside_rth: bool = False,
+    tz: str = "America/New_York",
+) -> Optional[List[Dict[str, float]]]:
+    _check_freq(freq)
+    if not candles:
+        return None
+    bars, keys = _keys(_sorted(candles), freq, outside_rth, tz)
+    return arrays_to_candles(_aggregate(bars, keys))
+
+
+class Resampler:
+    def __init__(
+        self, freq: str, outside_rth: bool = False, tz: str = "America/New_York"
+    ):
+        _check_freq(freq)
+        self.freq = freq
+        self.outside_rth = outside_rth
+        self.tz = tz
+        self._completed: List[Bars] = []
+        self._partial: Optional[Dict[str, float]] = None
+
+    def update(self, candles: List[Dict[str, float]]) -> List[Dict[str, float]]:
+        if not candles:
+            return []
+        bars, keys = _keys(_sorted(candles), self.freq, self.outside_rth, self.tz)
+        if self._partial is not None:
+            # Minute candles older than the open bar cannot be folded in any more
+            keep = keys >= self._partial["datetime"]
+            bars = {k: v[keep] for k, v in bars.items()}
+            keys = keys[keep]
+        agg = arrays_to_candles(_aggregate(bars, keys))
+        if not agg:
+            return []
+
+        completed = []
+        partial = self._partial
+        for bar in agg:
+            if partial is not None and bar["datetime"] == partial["datetime"]:
+                partial = {
+                    "open": partial["open"],
+                    "high": max(partial["high"], bar["high"]),
+                    "low": min(partial["low"], bar["low"]),
+                    "close": bar["close"],
+                    "volume": partial["volume"] + bar["volume"],
+                    "datetime": partial["datetime"],
+                }
+            else:
+                if partial is not None:
+                    completed.append(partial)
+                partial = bar
+        self._partial = partial
+
+        if completed:
+            self._completed.append(candles_to_arrays(completed))
+        return completed
+
+    def bars(self, include_partial: bool = True) -> List[Dict[str, float]]:
+        out = []
+        for chunk in self._completed:
+            out.extend(arrays_to_candles(chunk))
+        if include_partial and self._partial is not None:
+            out.append(dict(self._partial))
+        return out
@@ -0,0 +1,99 @@
+import csv
+import json
+import heapq
+from datetime import datetime, timedelta
+from typing import List, Dict, Tuple, Iterable, Iterator
+
+import numpy as np
+
+from .resample import PRICE_FIELDS
+
+Candle = Dict[str, float]
+AlignedBar = Tuple[int, Dict[str, Candle]]
+
+
+def history_source(
+    client,
+    symbol: str,
+    start_dt: datetime,
+    end_dt: datetime = None,
+    freq: str = "d",
+    outside_rth: bool = False,
+    window: timedelta = None,
+) -> Iterator[Candle]:
+    # Fetch window by window so only one window of candles is ever held
+    end_dt = end_dt or datetime.today()
+    if window is None:
+        window = timedelta(days=1) if "min" in freq else timedelta(days=365)
+    last = None
+    lo = start_dt
+    while lo <= end_dt:
+        hi = min(lo + window, end_dt)
+        candles = client.get_history(
+            symbol, start_dt=lo, end_dt=hi, freq=freq, outside_rth=outside_rth
+        )
+        for candle in candles or []:
+            # Window edges overlap, never yield the same bar twice
+            if last is None or candle["datetime"] > last:
+                last = candle["datetime"]
+                yield candle
+        lo = hi + timedelta(microseconds=1)
+
+
+def ndjson_source(path: str) -> Iterator[Candle]:
+    with open(path) as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def csv_source(path: str) -> Iterator[Candle]:
+    with open(path, newline="") as f:
+        for row in csv.DictReader(f):
+            candle = {k: float(row[k]) for k in PRICE_FIELDS}
+            candle["datetime"] = int(row["datetime"])
+            yield candle
+
+
+def _tag(symbol: str, source: Iterable[Candle]) -> Iterator[Tuple[int, str, Candle]]:
+    for candle in source:
+        yield candle["datetime"], symbol, candle
+
+
+def merge_sources(sources: Dict[str, Iterable[Candle]]) -> Iterator[AlignedBar]:
+    # k-way merge on timestamp, every source is only read one candle ahead
+    tagged = [_tag(symbol, source) for symbol, source in sources.items()]
+    current_ts = None
+    bars: Dict[str, Candle] = {}
+    for ts, symbol, candle in heapq.merge(*tagged, key=lambda x: x[0]):
+        if ts != current_ts:
+            if bars:
+                yield current_ts, bars
+            current_ts, bars = ts, {}
+        bars[symbol] = candle
+    if bars:
+        yield current_ts, bars
+
+
+def iter_blocks(
+    sources: Dict[str, Iterable[Candle]],
+    block_size: int = 1024,
+    fields: List[str] = None,
+) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+    # (timestamps, values[time, symbol, field]), NaN where a symbol has no bar
+    fields = list(fields or PRICE_FIELDS)
+    columns = {s: i for i, s in enumerate(sources)}
+    timestamps = np.empty(block_size, dtype=np.int64)
+    values = np.full((block_size, len(columns), len(fields)), np.nan)
+    n = 0
+    for ts, bars in merge_sources(sources):
+        timestamps[n] = ts
+        for symbol, candle in bars.items():
+            values[n, columns[symbol]] = [candle[f] for f in fields]
+        n += 1
+        if n == block_size:
+            yield timestamps.copy(), values.copy()
+            values.fill(np.nan)
+            n = 0
+    if n:
+        yield timestamps[:n].copy(), values[:n].copy()
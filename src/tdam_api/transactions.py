@@ -0,0 +1,104 @@
+import os
+import json
+import threading
+from datetime import date, timedelta
+from typing import List, Dict, Tuple, Iterable, Iterator, Hashable
+
+from .entities import Transaction
+
+Window = Tuple[date, date]
+
+# TD rejects ranges longer than a year, keep each request well below that
+DEFAULT_WINDOW = timedelta(days=30)
+# Windows are multiples of the window length from here, not from the caller's
+# start, so moving ranges keep hitting the same cached windows
+WINDOW_EPOCH = date(1970, 1, 1)
+
+
+def date_windows(start: date, end: date, window: timedelta = DEFAULT_WINDOW):
+    # Inclusive, non-overlapping, aligned [lo, hi] date ranges covering start..end
+    step = max(window.days, 1)
+    offset = (start - WINDOW_EPOCH).days // step * step
+    lo = WINDOW_EPOCH + timedelta(days=offset)
+    while lo <= end:
+        hi = lo + timedelta(days=step - 1)
+        yield lo, hi
+        lo = hi + timedelta(days=1)
+
+
+def is_closed(window: Window, today: date = None) -> bool:
+    # Transactions for past dates no longer change once the day has settled
+    return window[1] < (today or date.today())
+
+
+class TransactionCache:
+    # Raw responses of closed windows, in memory and optionally under path
+    def __init__(self, path: str = None):
+        self.path = path
+        self._data: Dict[Hashable, List[dict]] = {}
+        self._lock = threading.Lock()
+        if path is not None:
+            os.makedirs(path, exist_ok=True)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def _file(self, key: Tuple) -> str:
+        name = "_".join(str(k) for k in key if k is not None)
+        return os.path.join(self.path, name + ".json")
+
+    def get(self, key: Tuple) -> List[dict]:
+        with self._lock:
+            if key in self._data:
+                return self._data[key]
+        if self.path is None or not os.path.exists(self._file(key)):
+            return None
+        with open(self._file(key)) as f:
+            data = json.load(f)
+        with self._lock:
+            self._data[key] = data
+        return data
+
+    def set(self, key: Tuple, data: List[dict]):
+        with self._lock:
+            self._data[key] = data
+        if self.path is not None:
+            # Write then rename so a crash never leaves a partial window behind
+            tmp = self._file(key) + ".tmp"
+            with open(tmp, "w") as f:
+                json.dump(data, f)
+            os.replace(tmp, self._file(key))
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+def transactions_frame(transactions: Iterable[Transaction]):
+    import pandas as pd
+
+    try:
+        from pandas import json_normalize
+    except ImportError:
+        # pandas < 1.0
+        from pandas.io.json import json_normalize
+
+    # One flat row per transaction, nested fields as dotted columns
+    df = json_normalize([t._get_data() for t in transactions])
+    for col in ("transactionDate", "settlementDate", "orderDate"):
+        if col in df.columns:
+            df[col] = pd.to_datetime(df[col], utc=True)
+    if "transactionDate" in df.columns:
+        df.set_index("transactionDate", inplace=True)
+    return df
+
+
+def flatten(
+    windows: Iterable[List[dict]], start: date, end: date
+) -> Iterator[Transaction]:
+    # Aligned windows can reach past the requested range, trim on the way out
+    lo, hi = start.isoformat(), end.isoformat()
+    for raw in windows:
+        for t in raw:
+            if lo <= t.get("transactionDate", "")[:10] <= hi:
+                yield Transaction(t)
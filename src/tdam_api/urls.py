@@ -13,6 +13,7 @@ class Urls:
 
     all_orders = _base + "orders"
     order_for_account = _base + "accounts/%s/orders"
+    order = _base + "accounts/%s/orders/%s"
     transactions = _base + "accounts/%s/transactions"
 
     hours = _base + "marketdata/hours"
@@ -0,0 +1,157 @@
+from datetime import date, datetime
+from typing import List, Dict, Union, Tuple
+
+import attr
+import numpy as np
+
+from .common import number
+from .entities import Option, OptionChain, InvalidArgument
+
+DAYS_PER_YEAR = 365.0
+# Floor for time to expiry on expiration day, one hour
+MIN_T = 1.0 / (DAYS_PER_YEAR * 24)
+DEFAULT_DELTAS = np.round(np.arange(0.05, 0.951, 0.05), 2)
+
+Expiry = Union[str, date, float]
+
+
+def _side(options: Dict[str, Option], strikes: List[str], field: str) -> np.ndarray:
+    return np.array(
+        [
+            number(options[s]._get_data().get(field)) if s in options else np.nan
+            for s in strikes
+        ]
+    )
+
+
+@attr.s(frozen=True)
+class SmileData:
+    strikes: np.ndarray = attr.ib()
+    ivs: np.ndarray = attr.ib()
+    call_deltas: np.ndarray = attr.ib()
+
+    @classmethod
+    def from_chain(cls, chain: OptionChain) -> "SmileData":
+        keys = sorted(set(chain._calls) | set(chain._puts), key=float)
+        strikes = np.array([float(k) for k in keys])
+        call_iv = _side(chain._calls, keys, "volatility") / 100.0
+        put_iv = _side(chain._puts, keys, "volatility") / 100.0
+        call_delta = _side(chain._calls, keys, "delta")
+
+        # TD reports missing vols as -999 or NaN
+        call_iv[~(call_iv > 0)] = np.nan
+        put_iv[~(put_iv > 0)] = np.nan
+        # Out of the money side: calls above the 50 delta strike, puts below
+        use_call = np.where(np.isnan(call_delta), True, call_delta <= 0.5)
+        iv = np.where(use_call, call_iv, put_iv)
+        iv = np.where(np.isnan(iv), np.where(use_call, put_iv, call_iv), iv)
+
+        valid = ~np.isnan(iv)
+        return cls(strikes[valid], iv[valid], call_delta[valid])
+
+
+class VolSurface:
+    def __init__(
+        self,
+        chains: Dict[str, OptionChain],
+        as_of: date = None,
+        strikes: np.ndarray = None,
+        deltas: np.ndarray = None,
+    ):
+        self.as_of = as_of or date.today()
+        self._smiles: Dict[str, SmileData] = {}
+        self._rows: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+        self._grid = None
+        for expiry, chain in chains.items():
+            self._smiles[expiry] = SmileData.from_chain(chain)
+        if strikes is None:
+            all_strikes = [s.strikes for s in self._smiles.values()]
+            strikes = np.unique(np.concatenate(all_strikes)) if all_strikes else []
+        self.strikes = np.asarray(strikes, dtype=np.float64)
+        self.deltas = np.asarray(
+            DEFAULT_DELTAS if deltas is None else deltas, dtype=np.float64
+        )
+
+    @property
+    def expiries(self) -> List[str]:
+        return sorted(self._smiles)
+
+    def time_to_expiry(self, expiry: Expiry) -> float:
+        if isinstance(expiry, (int, float)):
+            return max(float(expiry), MIN_T)
+        if isinstance(expiry, str):
+            expiry = datetime.strptime(expiry, "%Y-%m-%d").date()
+        return max((expiry - self.as_of).days / DAYS_PER_YEAR, MIN_T)
+
+    def update(self, expiry: str, chain: OptionChain):
+        # Only the refreshed expiry is re-interpolated
+        self._smiles[expiry] = SmileData.from_chain(chain)
+        self._rows.pop(expiry, None)
+        self._grid = None
+
+    def _row(self, expiry: str) -> Tuple[np.ndarray, np.ndarray]:
+        if expiry not in self._rows:
+            smile = self._smiles[expiry]
+            if len(smile.strikes) == 0:
+                by_strike = np.full(len(self.strikes), np.nan)
+                by_delta = np.full(len(self.deltas), np.nan)
+            else:
+                by_strike = np.interp(self.strikes, smile.strikes, smile.ivs)
+                ok = ~np.isnan(smile.call_deltas)
+                if ok.any():
+                    # Call delta falls with strike, np.interp wants it rising
+                    order = np.argsort(smile.call_deltas[ok])
+                    by_delta = np.interp(
+                        self.deltas,
+                        smile.call_deltas[ok][order],
+                        smile.ivs[ok][order],
+                    )
+                else:
+                    by_delta = np.full(len(self.deltas), np.nan)
+            self._rows[expiry] = (by_strike, by_delta)
+        return self._rows[expiry]
+
+    def grid(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        # (expiries, times, strike grid ivs, delta grid ivs) sorted by time
+        if self._grid is None:
+            expiries = self.expiries
+            times = np.array([self.time_to_expiry(e) for e in expiries])
+            rows = [self._row(e) for e in expiries]
+            by_strike = np.array([r[0] for r in rows]).reshape(
+                len(expiries), len(self.strikes)
+            )
+            by_delta = np.array([r[1] for r in rows]).reshape(
+                len(expiries), len(self.deltas)
+            )
+            self._grid = (np.array(expiries), times, by_strike, by_delta)
+        return self._grid
+
+    def iv_many(self, strikes, expiries) -> np.ndarray:
+        _, times, by_strike, _ = self.grid()
+        if len(times) == 0:
+            raise InvalidArgument("Volatility surface has no expirations")
+        strikes = np.atleast_1d(np.asarray(strikes, dtype=np.float64))
+        if isinstance(expiries, (str, date, int, float)):
+            expiries = [expiries]
+        t = np.array([self.time_to_expiry(e) for e in expiries])
+        strikes, t = np.broadcast_arrays(strikes, t)
+
+        # Smile of every expiry at every query strike, then linear in total variance
+        smiles = np.array([np.interp(strikes, self.strikes, row) for row in by_strike])
+        if len(times) == 1:
+            return smiles[0]
+        variance = smiles**2 * times[:, None]
+        hi = np.clip(np.searchsorted(times, t), 1, len(times) - 1)
+        lo = hi - 1
+        cols = np.arange(len(t))
+        w = (t - times[lo]) / (times[hi] - times[lo])
+        w = np.clip(w, 0.0, 1.0)
+        total = variance[lo, cols] * (1 - w) + variance[hi, cols] * w
+        return np.sqrt(total / np.clip(t, times[0], times[-1]))
+
+    def iv(self, strike: float, expiry: Expiry) -> float:
+        return float(self.iv_many([strike], [expiry])[0])
+
+    def iv_by_delta(self, delta: float, expiry: str) -> float:
+        _, by_delta = self._row(expiry)
+        return float(np.interp(delta, self.deltas, by_delta))
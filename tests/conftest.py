@@ -0,0 +1,25 @@
+import json
+
+import pytest
+
+from tdam_api.quotetable import QuoteTable
+
+
+@pytest.fixture
+def quotes_table():
+    # Builds a stand-in for TDClient.quotes_table from {symbol: (bid, ask)}
+    def factory(prices: dict):
+        output = {
+            sym: {"symbol": sym, "bidPrice": bid, "askPrice": ask, "lastPrice": None}
+            for sym, (bid, ask) in prices.items()
+        }
+        return lambda symbols, fields: QuoteTable.from_response(output, fields)
+
+    return factory
+
+
+@pytest.fixture
+def chain_json() -> dict:
+    # A fresh copy per test, tests are free to modify it
+    with open("tests/data/aapl_one_expiry.json", "r") as json_file:
+        return json.load(json_file)
@@ -0,0 +1,175 @@
+import io
+import os
+import csv
+import json
+
+import pytest
+import responses
+
+from tdam_api import cli
+from tdam_api.urls import Urls
+
+apikey = os.environ["TDAM_APP_ID"]
+
+
+def quotes_callback(request):
+    symbols = request.params["symbol"].split(",")
+    body = {
+        s: {"symbol": s, "lastPrice": 100.0 + i, "exchange": "NASDAQ"}
+        for i, s in enumerate(symbols)
+        if s != "NOPE"
+    }
+    return (200, {}, json.dumps(body))
+
+
+def history_callback(request):
+    symbol = request.url.split("/")[-2]
+    candles = [
+        {
+            "open": 1.0,
+            "high": 2.0,
+            "low": 0.5,
+            "close": 1.5,
+            "volume": 100,
+            "datetime": 1546300800000 + i * 86400000,
+        }
+        for i in range(3)
+    ]
+    body = {"candles": candles, "symbol": symbol, "empty": False}
+    return (200, {}, json.dumps(body))
+
+
+def test_read_symbols(tmp_path, monkeypatch):
+    path = tmp_path / "symbols.txt"
+    path.write_text("aapl, msft\n# comment\n\nibm fb\naapl\n")
+    monkeypatch.setattr("sys.stdin", io.StringIO("tsla\n"))
+    symbols = cli.read_symbols(["spy"], [str(path), "-"])
+    assert list(symbols) == ["SPY", "AAPL", "MSFT", "IBM", "FB", "TSLA"]
+
+
+@responses.activate
+def test_quotes_ndjson_from_stdin(monkeypatch, capsys):
+    responses.add_callback(responses.GET, Urls.quote, callback=quotes_callback)
+    monkeypatch.setattr("sys.stdin", io.StringIO("aapl\nmsft\nnope\n"))
+    monkeypatch.setattr(cli, "QUOTE_BATCH", 2)
+
+    assert cli.main(["quotes", "--no-auth"]) == 0
+    lines = capsys.readouterr().out.splitlines()
+    records = [json.loads(line) for line in lines]
+    assert [r["symbol"] for r in records] == ["AAPL", "MSFT"]
+    # The batch holding only the unknown symbol is skipped, not fatal
+    assert len(responses.calls) == 2
+
+
+@responses.activate
+def test_history_csv(tmp_path):
+    responses.add_callback(
+        responses.GET, Urls.history % "AAPL", callback=history_callback
+    )
+    responses.add_callback(
+        responses.GET, Urls.history % "MSFT", callback=history_callback
+    )
+    out = tmp_path / "history.csv"
+    args = ["history", "aapl", "msft", "--start", "2019-01-01", "--end", "2019-01-31"]
+    assert cli.main(args + ["--no-auth", "--format", "csv", "-o", str(out)]) == 0
+
+    with open(str(out), newline="") as f:
+        rows = list(csv.DictReader(f))
+    assert len(rows) == 6
+    assert [r["symbol"] for r in rows] == ["AAPL"] * 3 + ["MSFT"] * 3
+    assert rows[0]["close"] == "1.5"
+
+
+@responses.activate
+def test_chain_ndjson(capsys, chain_json):
+    responses.add(responses.GET, Urls.option_chain, json=chain_json)
+
+    args = ["chain", "aapl", "--expiry", "2019-08-23", "--no-auth"]
+    assert cli.main(args) == 0
+    records = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert records
+    assert {r["underlying"] for r in records} == {"AAPL"}
+    assert {r["putCall"] for r in records} == {"CALL", "PUT"}
+
+    with pytest.raises(SystemExit):
+        cli.main(["chain", "aapl", "--no-auth"])
+
+
+MIXED_QUOTES = {
+    "$SPX.X": {"symbol": "$SPX.X", "assetType": "INDEX", "lastPrice": 2900.5},
+    "SPY": {"symbol": "SPY", "assetType": "ETF", "lastPrice": 290, "nAV": 290.1},
+    "AAPL": {
+        "symbol": "AAPL",
+        "assetType": "EQUITY",
+        "lastPrice": 201.5,
+        "peRatio": 18.2,
+        "marginable": True,
+        "newField": 1,
+    },
+    "AAPL_082319C200": {
+        "symbol": "AAPL_082319C200",
+        "assetType": "OPTION",
+        "lastPrice": 3.1,
+        "delta": 0.55,
+        "strikePrice": 200,
+    },
+}
+
+
+def mixed_quotes_callback(request):
+    symbols = request.params["symbol"].split(",")
+    return (200, {}, json.dumps({s: MIXED_QUOTES[s] for s in symbols}))
+
+
+@responses.activate
+def test_quotes_csv_mixed_asset_types(tmp_path, capsys):
+    responses.add_callback(responses.GET, Urls.quote, callback=mixed_quotes_callback)
+    out = tmp_path / "quotes.csv"
+    args = ["quotes", "--no-auth", "--format", "csv", "-o", str(out)]
+    assert cli.main(args + list(MIXED_QUOTES)) == 0
+
+    with open(str(out), newline="") as f:
+        rows = {r["symbol"]: r for r in csv.DictReader(f)}
+    # Columns do not depend on the index quote that comes first
+    assert rows["$SPX.X"]["peRatio"] == ""
+    assert rows["AAPL"]["peRatio"] == "18.2"
+    assert rows["AAPL"]["marginable"] == "True"
+    assert rows["SPY"]["nAV"] == "290.1"
+    assert rows["AAPL_082319C200"]["delta"] == "0.55"
+    # Unknown fields are reported instead of vanishing silently
+    assert "newField" in capsys.readouterr().err
+
+
+def test_coerce():
+    assert cli._coerce(290, "float") == 290.0
+    assert cli._coerce(3.0, "int") == 3
+    assert cli._coerce("1X1", "float") is None
+    assert cli._coerce(True, "float") is None
+    assert cli._coerce([1], "str") == "[1]"
+    assert cli._coerce(None, "int") is None
+
+
+@responses.activate
+def test_parquet(tmp_path):
+    pq = pytest.importorskip("pyarrow.parquet")
+    responses.add_callback(responses.GET, Urls.quote, callback=quotes_callback)
+    out = tmp_path / "quotes.parquet"
+    args = ["quotes", "aapl", "msft", "--no-auth", "--format", "parquet"]
+    assert cli.main(args + ["-o", str(out)]) == 0
+    assert pq.read_table(str(out)).column("symbol").to_pylist() == ["AAPL", "MSFT"]
+
+
+@responses.activate
+def test_parquet_mixed_asset_types(tmp_path, monkeypatch):
+    pq = pytest.importorskip("pyarrow.parquet")
+    responses.add_callback(responses.GET, Urls.quote, callback=mixed_quotes_callback)
+    # The first response holds only the index quote, without peRatio or delta
+    monkeypatch.setattr(cli, "QUOTE_BATCH", 1)
+    out = tmp_path / "quotes.parquet"
+    args = ["quotes", "--no-auth", "--format", "parquet", "-o", str(out)]
+    assert cli.main(args + list(MIXED_QUOTES)) == 0
+
+    table = pq.read_table(str(out)).to_pydict()
+    assert table["peRatio"] == [None, None, 18.2, None]
+    assert table["lastPrice"] == [2900.5, 290.0, 201.5, 3.1]
+    assert table["strikePrice"][3] == 200.0
@@ -15,6 +15,7 @@ from tdam_api.entities import (
     InvalidArgument,
 )
 from tdam_api.urls import Urls
+from tdam_api.cache import TTLCache
 
 apikey = os.environ["TDAM_APP_ID"]
 
@@ -105,6 +106,53 @@ def test_get_fundamentals():
     assert res.peRatio == 18.15
 
 
+@responses.activate
+def test_get_fundamentals_many():
+    c = TDClient(authenticated=False)
+    c.fundamentals_chunk_size = 2
+
+    def add(symbols):
+        body = {}
+        for sym in symbols:
+            body.update(fundamental_resp(sym))
+        responses.add(
+            responses.GET,
+            Urls.search
+            + f"?apikey={apikey}&symbol={','.join(symbols)}&projection=fundamental",
+            json=body,
+            status=200,
+        )
+
+    add(["AAPL", "MSFT"])
+    add(["FB"])
+    res = c.get_fundamentals_many(["aapl", "msft", "fb", "AAPL"])
+    assert list(res) == ["AAPL", "MSFT", "FB"]
+    assert all(isinstance(v, Fundamental) for v in res.values())
+    assert len(responses.calls) == 2
+
+    # Served from the cache until the TTL runs out
+    res = c.get_fundamentals_many(["fb", "msft"])
+    assert list(res) == ["FB", "MSFT"]
+    assert c.get_fundamentals("aapl").peRatio == 18.15
+    assert len(responses.calls) == 2
+
+    df = c.get_fundamentals_many(["AAPL", "FB"], as_frame=True)
+    assert list(df.index) == ["AAPL", "FB"]
+    assert list(df["marketCap"]) == [234343, 234343]
+
+
+def test_fundamentals_cache_expiry():
+    now = [0.0]
+    cache = TTLCache(timedelta(days=1), clock=lambda: now[0])
+    cache.set("AAPL", 1)
+    assert cache.get("AAPL") == 1
+    now[0] = 86399
+    assert "AAPL" in cache
+    now[0] = 86400
+    assert cache.get("AAPL") is None
+    assert len(cache) == 0
+
+
 def test_stock():
     c = TDClient(authenticated=False)
     with mock.patch.object(TDClient, "quote") as m:
@@ -260,3 +308,112 @@ def test_get_intraday_history_df_unauth():
             end_dt=datetime.today() - timedelta(55),
             freq="30min",
         )
+
+
+@responses.activate
+def test_quotes_table():
+    import numpy as np
+
+    c = TDClient(authenticated=False)
+    body = {
+        "AAPL": {
+            "symbol": "AAPL",
+            "bidPrice": 201.5,
+            "askPrice": 201.6,
+            "totalVolume": 900,
+        },
+        "MSFT": {
+            "symbol": "MSFT",
+            "bidPrice": 137.1,
+            "askPrice": 137.2,
+            "totalVolume": 1200,
+        },
+        "FB": {"symbol": "FB", "bidPrice": None, "askPrice": 180.0, "totalVolume": 50},
+    }
+    responses.add(
+        responses.GET,
+        Urls.quote + f"?apikey={apikey}&symbol=AAPL,MSFT,FB",
+        json=body,
+        status=200,
+    )
+    table = c.quotes_table(
+        ["aapl", "msft", "fb"], ["bidPrice", "askPrice", "totalVolume"]
+    )
+    assert len(table) == 3
+    assert table.symbols == ["AAPL", "MSFT", "FB"]
+    assert table["askPrice"].tolist() == [201.6, 137.2, 180.0]
+    assert np.isnan(table.row("FB")["bidPrice"])
+
+    liquid = table.filter(table["totalVolume"] > 100)
+    assert liquid.symbols == ["AAPL", "MSFT"]
+    assert table.sort("totalVolume", descending=True).symbols == ["MSFT", "AAPL", "FB"]
+    assert table.sort("bidPrice").symbols == ["MSFT", "AAPL", "FB"]
+
+    aligned = table.reindex(["FB", "TSLA"])
+    assert aligned[0, 1] == 180.0
+    assert np.isnan(aligned[1]).all()
+
+    df = table.to_pandas()
+    assert list(df.index) == ["AAPL", "MSFT", "FB"]
+    assert np.shares_memory(df["askPrice"].to_numpy(), table.values)
+
+
+def test_quotes_table_non_numeric():
+    import numpy as np
+    from tdam_api.quotetable import QuoteTable
+
+    output = {
+        "AAPL": {"marginable": True, "divDate": "12.5", "mark": 1.0},
+        "MSFT": {"marginable": False, "divDate": "13.0", "mark": 2},
+    }
+    table = QuoteTable.from_response(output, ["marginable", "divDate", "mark"])
+    # Flags and numeric looking strings are not numbers, same as the recorder
+    assert np.isnan(table["marginable"]).all()
+    assert np.isnan(table["divDate"]).all()
+    assert table["mark"].tolist() == [1.0, 2.0]
+
+
+def movers_resp(*movers) -> list:
+    return [
+        {
+            "symbol": s,
+            "change": c,
+            "direction": "up" if c > 0 else "down",
+            "last": 100.0,
+            "totalVolume": 1000,
+            "description": s,
+        }
+        for s, c in movers
+    ]
+
+
+@responses.activate
+def test_get_movers():
+    c = TDClient(authenticated=False)
+    body = {
+        ("$DJI", "up"): movers_resp(("AAPL", 0.03), ("MSFT", 0.01)),
+        ("$DJI", "down"): movers_resp(("IBM", -0.05)),
+        ("$SPX.X", "up"): movers_resp(("AAPL", 0.03), ("NVDA", 0.04)),
+        ("$SPX.X", "down"): movers_resp(("IBM", -0.05), ("F", -0.02)),
+    }
+    for (index, direction), movers in body.items():
+        responses.add(
+            responses.GET,
+            Urls.movers % index
+            + f"?direction={direction}&change=percent&apikey={apikey}",
+            json=movers,
+        )
+
+    movers = c.get_movers(["$dji", "$spx.x"])
+    assert len(responses.calls) == 4
+    assert [m.symbol for m in movers] == ["IBM", "NVDA", "AAPL", "F", "MSFT"]
+    assert movers[0].indexes == ["$DJI", "$SPX.X"]
+    assert movers[1].indexes == ["$SPX.X"]
+
+    top = c.get_movers(["$DJI", "$SPX.X"], directions=["up"], limit=2, as_frame=True)
+    assert list(top.index) == ["NVDA", "AAPL"]
+    # Served from the movers cache
+    assert len(responses.calls) == 4
+
+    with pytest.raises(InvalidArgument):
+        c.get_movers(directions=["sideways"])
@@ -0,0 +1,181 @@
+import os
+import json
+from datetime import date, datetime, timedelta, timezone
+from unittest import mock
+
+import responses
+
+from tdam_api import TDClient
+from tdam_api.cache import TTLCache
+from tdam_api.entities import MarketHours
+from tdam_api.hours import MarketCalendar, parse_session_time
+from tdam_api.urls import Urls
+
+apikey = os.environ["TDAM_APP_ID"]
+
+
+def hours_resp(day: date) -> dict:
+    d = day.isoformat()
+    if day.weekday() >= 5:
+        return {
+            "equity": {"equity": {"date": d, "marketType": "EQUITY", "isOpen": False}}
+        }
+    return {
+        "equity": {
+            "EQ": {
+                "date": d,
+                "marketType": "EQUITY",
+                "isOpen": True,
+                "sessionHours": {
+                    "preMarket": [
+                        {"start": f"{d}T07:00:00-04:00", "end": f"{d}T09:30:00-04:00"}
+                    ],
+                    "regularMarket": [
+                        {"start": f"{d}T09:30:00-04:00", "end": f"{d}T16:00:00-04:00"}
+                    ],
+                    "postMarket": [
+                        {"start": f"{d}T16:00:00-04:00", "end": f"{d}T20:00:00-04:00"}
+                    ],
+                },
+            }
+        }
+    }
+
+
+class FakeHoursClient:
+    def __init__(self):
+        self.calls = 0
+
+    def get_market_hours(self, markets, day):
+        self.calls += 1
+        output = hours_resp(day)["equity"]
+        return {k: MarketHours(v) for k, v in output.items()}
+
+
+def utc(*args) -> datetime:
+    return datetime(*args, tzinfo=timezone.utc)
+
+
+def test_parse_session_time():
+    t = parse_session_time("2019-08-23T09:30:00-04:00")
+    assert t == utc(2019, 8, 23, 13, 30)
+
+
+@responses.activate
+def test_get_market_hours():
+    c = TDClient(authenticated=False)
+    day = date(2019, 8, 23)
+    responses.add(
+        responses.GET,
+        Urls.hours + f"?apikey={apikey}&markets=EQUITY&date=2019-08-23",
+        json=hours_resp(day),
+        status=200,
+    )
+    res = c.get_market_hours(["equity"], day)
+    assert isinstance(res["EQ"], MarketHours)
+    assert res["EQ"].isOpen
+
+    assert c.market_calendar("equity") is c.market_calendar("EQUITY")
+
+
+def test_market_calendar():
+    client = FakeHoursClient()
+    # Friday 2019-08-23
+    cal = MarketCalendar(client)
+    assert cal.is_open(utc(2019, 8, 23, 14, 0))
+    assert not cal.is_open(utc(2019, 8, 23, 12, 0))
+    assert cal.is_open(utc(2019, 8, 23, 12, 0), outside_rth=True)
+    # 21:00 ET Friday is 01:00 UTC Saturday
+    assert not cal.is_open(utc(2019, 8, 24, 1, 0), outside_rth=True)
+
+    saturday = utc(2019, 8, 24, 15, 0)
+    assert not cal.is_open(saturday)
+    assert cal.next_open(saturday) == utc(2019, 8, 26, 13, 30)
+    assert cal.next_open(saturday, outside_rth=True) == utc(2019, 8, 26, 11, 0)
+    assert cal.time_to_open(saturday) == timedelta(days=1, hours=22, minutes=30)
+
+    # Calendar days are cached
+    calls = client.calls
+    cal.is_open(saturday)
+    assert client.calls == calls
+
+
+def test_session_aware_ttl():
+    now = [utc(2019, 8, 23, 14, 0)]
+    cal = MarketCalendar(FakeHoursClient(), now=lambda: now[0])
+    clock = [0.0]
+    cache = TTLCache(cal.session_ttl(timedelta(seconds=5)), clock=lambda: clock[0])
+
+    cache.set("AAPL", 1)
+    clock[0] = 5
+    assert cache.get("AAPL") is None
+    assert cal.poll_delay(1.0) == 1.0
+
+    # After the close entries live until the next open, pollers back off
+    now[0] = utc(2019, 8, 23, 21, 0)
+    cache.set("AAPL", 2)
+    clock[0] = 5 + 3600 * 12
+    assert cache.get("AAPL") == 2
+    assert (
+        cal.poll_delay(1.0) == timedelta(days=2, hours=16, minutes=30).total_seconds()
+    )
+
+
+def test_session_ttl_cost():
+    now = [utc(2019, 8, 24, 14, 0)]
+    cal = MarketCalendar(FakeHoursClient(), now=lambda: now[0])
+    with mock.patch(
+        "tdam_api.hours.parse_session_time", wraps=parse_session_time
+    ) as parse:
+        ttl = mock.Mock(wraps=cal.session_ttl(timedelta(seconds=5)))
+        first = ttl()
+        calls = parse.call_count
+        # Sessions are parsed once per day, not on every ttl lookup
+        for _ in range(100):
+            assert ttl() == first
+        assert parse.call_count == calls
+
+    # A bulk response evaluates the ttl once
+    cache = TTLCache(ttl)
+    ttl.reset_mock()
+    cache.set_many((f"S{i}", i) for i in range(1000))
+    assert ttl.call_count == 1
+    assert len(cache) == 1000 and cache.get("S999") == 999
+
+
+def hours_callback(request):
+    day = datetime.strptime(request.params["date"], "%Y-%m-%d").date()
+    return (200, {}, json.dumps(hours_resp(day)))
+
+
+@responses.activate
+def test_client_session_aware_caches():
+    responses.add_callback(responses.GET, Urls.hours, callback=hours_callback)
+    c = TDClient(
+        authenticated=False,
+        fundamentals_ttl=timedelta(minutes=10),
+        movers_ttl=timedelta(seconds=30),
+    )
+    assert c._movers_cache.ttl == timedelta(seconds=30)
+
+    cal = c.use_market_calendar()
+    assert cal is c.market_calendar()
+    now = [utc(2019, 8, 23, 14, 0)]
+    cal._now = lambda: now[0]
+    assert c._fundamentals_cache.ttl() == timedelta(minutes=10)
+    assert c._movers_cache.ttl() == timedelta(seconds=30)
+
+    # Friday after the close, entries are kept until Monday's open
+    now[0] = utc(2019, 8, 23, 21, 0)
+    until_open = timedelta(days=2, hours=16, minutes=30)
+    assert c._fundamentals_cache.ttl() == until_open
+    assert c._movers_cache.ttl() == until_open
+
+    # Installing again does not nest the wrappers
+    c.use_market_calendar()
+    c.market_calendar()._now = lambda: now[0]
+    assert c._movers_cache.ttl.open_ttl == timedelta(seconds=30)
+
+    c = TDClient(authenticated=False, session_aware=True)
+    assert callable(c._fundamentals_cache.ttl)
+    assert c._fundamentals_cache.ttl.open_ttl == timedelta(days=1)
@@ -0,0 +1,29 @@
+import sys
+import subprocess
+
+import pytest
+
+HEAVY = ["requests", "attr", "numpy", "pandas"]
+
+
+def loaded_after(statement: str) -> list:
+    code = f"import sys\n{statement}\nprint(','.join(m for m in {HEAVY!r} if m in sys.modules))"
+    out = subprocess.check_output([sys.executable, "-c", code], universal_newlines=True)
+    return [m for m in out.strip().split(",") if m]
+
+
+@pytest.mark.skipif(sys.version_info < (3, 7), reason="exports are eager on 3.6")
+def test_import_is_lazy():
+    assert loaded_after("import tdam_api") == []
+    # The client needs requests but never the analytics dependencies
+    assert loaded_after("from tdam_api import TDClient") == ["requests", "attr"]
+
+
+def test_exports():
+    import tdam_api
+
+    assert tdam_api.TDClient.__name__ == "TDClient"
+    assert tdam_api.Quote.__module__ == "tdam_api.entities"
+    assert set(tdam_api.__all__) <= set(dir(tdam_api))
+    with pytest.raises(AttributeError):
+        tdam_api.NotThere
@@ -0,0 +1,113 @@
+from datetime import datetime, timezone
+
+import numpy as np
+import pytest
+
+from tdam_api.indicators import (
+    Indicator,
+    IndicatorEngine,
+    SMA,
+    EMA,
+    RSI,
+    ATR,
+    VWAP,
+    history_arrays,
+)
+
+START_MS = int(datetime(2019, 8, 22, 13, 30, tzinfo=timezone.utc).timestamp()) * 1000
+
+
+def random_candles(n: int, seed: int = 7):
+    rng = np.random.RandomState(seed)
+    close = 100 + np.cumsum(rng.normal(0, 0.2, n))
+    out = []
+    for i in range(n):
+        c = float(close[i])
+        out.append(
+            {
+                "open": c - 0.05,
+                "high": c + rng.uniform(0, 0.3),
+                "low": c - rng.uniform(0, 0.3),
+                "close": c,
+                "volume": float(rng.randint(1, 1000)),
+                # 10 minute bars spill over into the next two sessions
+                "datetime": START_MS + i * 600000,
+            }
+        )
+    return out
+
+
+def engine() -> IndicatorEngine:
+    return IndicatorEngine(
+        {
+            "sma": SMA(20),
+            "ema": EMA(12),
+            "rsi": RSI(14),
+            "atr": ATR(14),
+            "vwap": VWAP(),
+            "vwap_all": VWAP(reset_daily=False),
+        }
+    )
+
+
+def test_updates_match_full_computation():
+    candles = random_candles(400)
+    expected = engine().compute(candles)
+
+    e = engine()
+    head = e.compute(candles[:150])
+    for name in head:
+        np.testing.assert_allclose(head[name], expected[name][:150], equal_nan=True)
+
+    for i, candle in enumerate(candles[150:], start=150):
+        latest = e.update(candle)
+        for name, value in latest.items():
+            assert value == pytest.approx(expected[name][i], nan_ok=True), (name, i)
+
+
+def test_updates_from_empty_state():
+    candles = random_candles(60)
+    expected = engine().compute(candles)
+    e = engine()
+    for i, candle in enumerate(candles):
+        latest = e.update(candle)
+        for name, value in latest.items():
+            assert value == pytest.approx(expected[name][i], nan_ok=True), (name, i)
+
+    assert np.isnan(expected["rsi"][:14]).all()
+    assert not np.isnan(expected["rsi"][14:]).any()
+    assert np.isnan(expected["atr"][:13]).all()
+    assert np.isnan(expected["sma"][:19]).all()
+
+
+def test_vwap_resets_per_session():
+    candles = random_candles(200)
+    vwap = VWAP().compute(history_arrays(candles))
+    # The first candle of the next session (00:00 ET) starts from its own price
+    first = next(
+        i for i, c in enumerate(candles) if c["datetime"] >= START_MS + 14.5 * 3600000
+    )
+    c = candles[first]
+    assert vwap[first] == pytest.approx((c["high"] + c["low"] + c["close"]) / 3)
+
+
+def test_history_dataframe_input():
+    import pandas as pd
+
+    candles = random_candles(50)
+    df = pd.DataFrame(candles)
+    df["datetime"] = pd.to_datetime(df["datetime"], unit="ms")
+    df.set_index("datetime", inplace=True)
+    from_df = engine().compute(df)
+    from_list = engine().compute(candles)
+    for name in from_list:
+        np.testing.assert_allclose(from_df[name], from_list[name], equal_nan=True)
+
+
+def test_incomplete_indicator_fails_on_creation():
+    class ComputeOnly(Indicator):
+        def compute(self, bars):
+            return bars["close"]
+
+    with pytest.raises(TypeError):
+        ComputeOnly()
@@ -0,0 +1,129 @@
+import os
+
+import responses
+
+from tdam_api import TDClient
+from tdam_api.entities import Instrument
+from tdam_api.instruments import InstrumentMaster, literal_prefix
+from tdam_api.urls import Urls
+
+apikey = os.environ["TDAM_APP_ID"]
+
+
+def instrument(symbol: str, cusip: str, description: str) -> Instrument:
+    return Instrument(
+        {
+            "symbol": symbol,
+            "cusip": cusip,
+            "description": description,
+            "exchange": "NASDAQ",
+            "assetType": "EQUITY",
+        }
+    )
+
+
+def sample_master() -> InstrumentMaster:
+    return InstrumentMaster(
+        instruments=[
+            instrument("LYFT", "55087P104", "Lyft, Inc. - Class A Common Stock"),
+            instrument("LYG", "539439109", "Lloyds Banking Group Plc"),
+            instrument("AAPL", "037833100", "Apple Inc. - Common Stock"),
+            instrument("AAP", "00751Y106", "Advance Auto Parts Inc Common Stock"),
+        ]
+    )
+
+
+def test_literal_prefix():
+    assert literal_prefix("lyf.*") == "LYF"
+    assert literal_prefix("AAPL") == "AAPL"
+    assert literal_prefix("AB?C") == "A"
+    assert literal_prefix("A|B") == ""
+    assert literal_prefix(r"\$SPX.*") == ""
+
+
+def test_search():
+    m = sample_master()
+    assert len(m) == 4
+    assert "lyft" in m
+    assert sorted(m.search("ly.*")) == ["LYFT", "LYG"]
+    assert sorted(m.search("lyf.*")) == ["LYFT"]
+    assert sorted(m.search("AAP")) == ["AAP"]
+    assert sorted(m.search("AAP.?")) == ["AAP", "AAPL"]
+    assert sorted(m.search(".*G")) == ["LYG"]
+    assert sorted(m.search_prefix("aa")) == ["AAP", "AAPL"]
+    assert m.search_prefix("ZZ") == {}
+
+
+def test_cusip_and_description():
+    m = sample_master()
+    assert m.get_by_cusip("037833100").symbol == "AAPL"
+    assert m.get_by_cusip("000000000") is None
+    assert sorted(m.search_description("common stock")) == ["AAP", "AAPL", "LYFT"]
+    assert sorted(m.search_description("apple")) == ["AAPL"]
+    assert m.search_description("apple lyft") == {}
+
+    m.remove(["AAPL"])
+    assert m.get_by_cusip("037833100") is None
+    assert sorted(m.search_description("common stock")) == ["AAP", "LYFT"]
+
+
+@responses.activate
+def test_load_instrument_master():
+    c = TDClient(authenticated=False)
+    responses.add(
+        responses.GET,
+        Urls.search + f"?apikey={apikey}&symbol=L.*&projection=symbol-regex",
+        json={
+            "LYFT": instrument("LYFT", "55087P104", "Lyft Inc")._get_data(),
+            "LYG": instrument("LYG", "539439109", "Lloyds Banking")._get_data(),
+        },
+        status=200,
+    )
+    m = c.load_instrument_master(["L.*"])
+    assert len(m) == 2
+
+    # Answered locally, no further network calls
+    res = c.find_instrument("lyf.*")
+    assert list(res) == ["LYFT"]
+    assert isinstance(res["LYFT"], Instrument)
+    assert len(responses.calls) == 1
+
+    # Fresh patterns are skipped, stale ones are re-fetched and delistings dropped
+    c.load_instrument_master(["L.*"], max_age=3600)
+    assert len(responses.calls) == 1
+
+    responses.replace(
+        responses.GET,
+        Urls.search + f"?apikey={apikey}&symbol=L.*&projection=symbol-regex",
+        json={"LYFT": instrument("LYFT", "55087P104", "Lyft Inc")._get_data()},
+        status=200,
+    )
+    c.load_instrument_master(["L.*"])
+    assert len(responses.calls) == 2
+    assert sorted(c.find_instrument("L.*")) == ["LYFT"]
+
+
+@responses.activate
+def test_find_instrument_outside_master():
+    c = TDClient(authenticated=False)
+    responses.add(
+        responses.GET,
+        Urls.search + f"?apikey={apikey}&symbol=L.*&projection=symbol-regex",
+        json={"LYFT": instrument("LYFT", "55087P104", "Lyft Inc")._get_data()},
+        status=200,
+    )
+    responses.add(
+        responses.GET,
+        Urls.search + f"?apikey={apikey}&symbol=AAPL&projection=symbol-regex",
+        json={"AAPL": instrument("AAPL", "037833100", "Apple Inc")._get_data()},
+        status=200,
+    )
+    m = c.load_instrument_master(["L.*"])
+    assert m.covers("LYF.*") and m.covers("L.*")
+    assert not m.covers("AAPL") and not m.covers(".*")
+
+    # Symbols the master never loaded still come from the API
+    assert list(c.find_instrument("AAPL")) == ["AAPL"]
+    assert len(responses.calls) == 2
+    assert c.find_instrument("LYFT") != {}
+    assert len(responses.calls) == 2
@@ -193,3 +193,46 @@ def test_get_option():
 
     with pytest.raises(SymbolNotFound):
         c.get_option(symbol="NO DICE", expiry=expiry, right="C", strike=strike)
+
+
+@responses.activate
+def test_refresh_option_chain():
+    c = TDClient(authenticated=False)
+    sym = "AAPL"
+    expiry = "2019-08-23"
+    url = Urls.option_chain + (
+        f"?apikey={apikey}&symbol={sym}"
+        f"&strategy=SINGLE&fromDate={expiry}&toDate={expiry}"
+    )
+
+    with open("tests/data/aapl_one_expiry.json", "r") as json_file:
+        chain_resp = json.load(json_file)
+
+    responses.add(responses.GET, url, json=chain_resp, status=200)
+    chain = c.get_live_option_chain("aapl", expiry)
+    assert isinstance(chain, OptionChain)
+    assert chain.symbol == sym
+    untouched = chain.get(145, "C")
+    assert (
+        chain.get(200, "C").bid
+        == chain_resp["callExpDateMap"]["2019-08-23:2"]["200.0"][0]["bid"]
+    )
+
+    strikes = chain_resp["callExpDateMap"]["2019-08-23:2"]
+    strikes["200.0"][0]["bid"] += 0.1
+    strikes["200.0"][0]["totalVolume"] += 5
+    del strikes["130.0"]
+    responses.replace(responses.GET, url, json=chain_resp, status=200)
+
+    update = c.refresh_option_chain(chain)
+    assert update
+    assert update.changed == {"AAPL_082319C200": {"bid", "totalVolume"}}
+    assert update.removed == {"AAPL_082319C130"}
+    assert update.added == set()
+    assert update.contracts == {"AAPL_082319C200", "AAPL_082319C130"}
+    assert chain.get(200, "C").bid == strikes["200.0"][0]["bid"]
+    assert chain.get(130, "C") is None
+    # Unchanged contracts keep the same Option instance
+    assert chain.get(145, "C") is untouched
+
+    assert not c.refresh_option_chain(chain)
@@ -0,0 +1,270 @@
+import os
+import threading
+from datetime import date
+
+import pytest
+import requests
+import responses
+
+from tdam_api import TDClient
+from tdam_api.entities import Order, InvalidArgument, OrderStateUnknown
+from tdam_api.orders import IdempotencyGuard, OrderTracker
+from tdam_api.urls import Urls
+
+apikey = os.environ["TDAM_APP_ID"]
+
+ACCOUNT = "123"
+ORDER = {
+    "orderType": "LIMIT",
+    "session": "NORMAL",
+    "duration": "DAY",
+    "price": "10.0",
+    "orderStrategyType": "SINGLE",
+    "orderLegCollection": [
+        {
+            "instruction": "BUY",
+            "quantity": 1,
+            "instrument": {"symbol": "AAPL", "assetType": "EQUITY"},
+        }
+    ],
+}
+
+
+def client() -> TDClient:
+    return TDClient(access_token="x", refresh_token="x", app_id=apikey)
+
+
+def order_resp(order_id: int, status: str) -> dict:
+    return {
+        "orderId": order_id,
+        "status": status,
+        "accountId": ACCOUNT,
+        "enteredTime": "2019-08-23T14:00:00+0000",
+    }
+
+
+@responses.activate
+def test_place_replace_cancel():
+    c = client()
+    location = Urls.order % (ACCOUNT, "1001")
+    responses.add(
+        responses.POST,
+        Urls.order_for_account % ACCOUNT,
+        status=201,
+        headers={"Location": location},
+    )
+    responses.add(
+        responses.PUT,
+        location,
+        status=201,
+        headers={"Location": Urls.order % (ACCOUNT, "1002")},
+    )
+    responses.add(responses.DELETE, Urls.order % (ACCOUNT, "1002"), status=200)
+
+    assert c.place_order(ACCOUNT, ORDER) == "1001"
+    assert c.replace_order(ACCOUNT, "1001", ORDER) == "1002"
+    c.cancel_order(ACCOUNT, "1002")
+    assert len(responses.calls) == 3
+
+
+@responses.activate
+def test_get_orders():
+    c = client()
+    responses.add(
+        responses.GET,
+        Urls.order % (ACCOUNT, "1001"),
+        json=order_resp(1001, "WORKING"),
+    )
+    responses.add(
+        responses.GET,
+        Urls.all_orders,
+        json=[order_resp(1001, "WORKING"), order_resp(1002, "FILLED")],
+    )
+
+    order = c.get_order(ACCOUNT, "1001")
+    assert isinstance(order, Order)
+    assert order.status == "WORKING"
+
+    orders = c.get_orders(status="working")
+    assert [o.orderId for o in orders] == [1001, 1002]
+    assert "status=WORKING" in responses.calls[1].request.url
+
+
+@responses.activate
+def test_place_orders_idempotent():
+    c = client()
+    ids = iter(range(2000, 2100))
+    lock = threading.Lock()
+
+    def callback(request):
+        with lock:
+            order_id = next(ids)
+        return (201, {"Location": Urls.order % (ACCOUNT, order_id)}, "")
+
+    responses.add_callback(
+        responses.POST, Urls.order_for_account % ACCOUNT, callback=callback
+    )
+
+    keys = ["a", "b", "c", "a", "b"]
+    out = c.place_orders(ACCOUNT, [ORDER] * 5, keys=keys, max_workers=3)
+    # Duplicate keys are submitted once and share the order id
+    assert len(responses.calls) == 3
+    assert out[0] == out[3] and out[1] == out[4]
+    assert len(set(out)) == 3
+
+    # Resubmitting a completed key does not post again
+    assert c.place_orders(ACCOUNT, [ORDER], keys=["c"]) == [out[2]]
+    assert len(responses.calls) == 3
+
+    with pytest.raises(InvalidArgument):
+        c.place_orders(ACCOUNT, [ORDER], keys=["a", "b"])
+
+
+@responses.activate
+def test_place_orders_partial_failure():
+    c = client()
+    responses.add(
+        responses.POST,
+        Urls.order_for_account % ACCOUNT,
+        status=201,
+        headers={"Location": Urls.order % (ACCOUNT, 3001)},
+    )
+    responses.add(responses.POST, Urls.order_for_account % ACCOUNT, status=400)
+    responses.add(
+        responses.POST,
+        Urls.order_for_account % ACCOUNT,
+        status=201,
+        headers={"Location": Urls.order % (ACCOUNT, 3002)},
+    )
+    out = c.place_orders(ACCOUNT, [ORDER] * 3, max_workers=1)
+    # The rejection is reported in place, the placed ids are not lost
+    assert out[0] == "3001" and out[2] == "3002"
+    assert isinstance(out[1], requests.HTTPError)
+    assert len(responses.calls) == 3
+
+
+def test_guard_ambiguous_failure():
+    guard = IdempotencyGuard()
+    calls = []
+
+    def timeout():
+        calls.append(1)
+        raise requests.Timeout()
+
+    def rejected():
+        calls.append(1)
+        response = requests.Response()
+        response.status_code = 400
+        raise requests.HTTPError(response=response)
+
+    with pytest.raises(requests.Timeout):
+        guard.run("a", timeout)
+    # The first attempt may have gone through, refuse to send it again
+    with pytest.raises(OrderStateUnknown):
+        guard.run("a", lambda: "1")
+    assert len(calls) == 1
+
+    guard.forget("a")
+    assert guard.run("a", lambda: "1") == "1"
+
+    # A definite rejection leaves the key free
+    with pytest.raises(requests.HTTPError):
+        guard.run("b", rejected)
+    assert "b" not in guard
+    assert guard.run("b", lambda: "2") == "2"
+
+
+@responses.activate
+def test_tracker_polls_open_orders():
+    c = client()
+    tracker = OrderTracker(c, ACCOUNT)
+    tracker.track(["1", "2"])
+
+    responses.add(
+        responses.GET, Urls.order % (ACCOUNT, "1"), json=order_resp(1, "WORKING")
+    )
+    responses.add(
+        responses.GET, Urls.order % (ACCOUNT, "2"), json=order_resp(2, "FILLED")
+    )
+    changed = tracker.poll()
+    assert sorted(o.orderId for o in changed) == [1, 2]
+    # Filled orders are no longer requested
+    assert tracker.open_orders == ["1"]
+    assert tracker.get("2").status == "FILLED"
+
+    responses.calls.reset()
+    assert tracker.poll() == []
+    assert len(responses.calls) == 1
+
+
+@responses.activate
+def test_tracker_bulk_poll():
+    c = client()
+    tracker = c.order_tracker(ACCOUNT)
+    tracker.bulk_threshold = 2
+    tracker.track(["1", "2"], entered=date(2019, 8, 20))
+    tracker.track(["3"], entered=date(2019, 8, 1))
+    tracker.track(["4"])
+
+    responses.add(
+        responses.GET,
+        Urls.order_for_account % ACCOUNT,
+        json=[
+            order_resp(1, "CANCELED"),
+            order_resp(2, "WORKING"),
+            order_resp(3, "WORKING"),
+            order_resp(9, "WORKING"),
+        ],
+    )
+    responses.add(
+        responses.GET, Urls.order % (ACCOUNT, "4"), json=order_resp(4, "WORKING")
+    )
+    changed = tracker.poll()
+    # One list request from the oldest tracked entry, untracked orders ignored
+    assert "fromEnteredTime=2019-08-01" in responses.calls[0].request.url
+    # Tracked orders missing from the list are fetched one by one
+    assert responses.calls[1].request.url.endswith("/orders/4")
+    assert len(responses.calls) == 2
+    assert sorted(o.orderId for o in changed) == [1, 2, 3, 4]
+    assert sorted(tracker.open_orders) == ["2", "3", "4"]
+
+
+@responses.activate
+def test_place_order_ambiguous_responses():
+    c = client()
+    url = Urls.order_for_account % ACCOUNT
+
+    # A gateway timeout may come after the broker accepted the order
+    responses.add(responses.POST, url, status=504)
+    with pytest.raises(requests.HTTPError):
+        c.place_order(ACCOUNT, ORDER, key="a")
+    responses.replace(
+        responses.POST,
+        url,
+        status=201,
+        headers={"Location": Urls.order % (ACCOUNT, "1001")},
+    )
+    with pytest.raises(OrderStateUnknown):
+        c.place_order(ACCOUNT, ORDER, key="a")
+    assert len(responses.calls) == 1
+
+    # Accepted without an order id is just as unknown
+    responses.replace(responses.POST, url, status=201)
+    with pytest.raises(OrderStateUnknown):
+        c.place_order(ACCOUNT, ORDER, key="b")
+    with pytest.raises(OrderStateUnknown):
+        c.place_order(ACCOUNT, ORDER, key="b")
+    assert len(responses.calls) == 2
+
+    # A 4xx is a definite rejection and the key can be retried
+    responses.replace(responses.POST, url, status=400)
+    with pytest.raises(requests.HTTPError):
+        c.place_order(ACCOUNT, ORDER, key="c")
+    responses.replace(
+        responses.POST,
+        url,
+        status=201,
+        headers={"Location": Urls.order % (ACCOUNT, "1002")},
+    )
+    assert c.place_order(ACCOUNT, ORDER, key="c") == "1002"
+    assert len(responses.calls) == 4
@@ -0,0 +1,79 @@
+import threading
+from unittest import mock
+
+from tdam_api.poller import QuotePoller
+
+
+def test_poll_once_emits_deltas(quotes_table):
+    client = mock.Mock()
+    poller = QuotePoller(
+        client, ["aapl", "msft", "AAPL"], fields=["bidPrice", "askPrice", "lastPrice"]
+    )
+    assert poller.symbols == ["AAPL", "MSFT"]
+
+    received = []
+    poller.subscribe(received.append)
+
+    client.quotes_table.side_effect = quotes_table(
+        {"AAPL": (1.0, 1.1), "MSFT": (2.0, 2.1)}
+    )
+    delta = poller.poll_once()
+    assert delta == {
+        "AAPL": {"bidPrice": 1.0, "askPrice": 1.1},
+        "MSFT": {"bidPrice": 2.0, "askPrice": 2.1},
+    }
+    client.quotes_table.assert_called_with(
+        ["AAPL", "MSFT"], ["bidPrice", "askPrice", "lastPrice"]
+    )
+
+    client.quotes_table.side_effect = quotes_table(
+        {"AAPL": (1.0, 1.2), "MSFT": (2.0, 2.1)}
+    )
+    assert poller.poll_once() == {"AAPL": {"askPrice": 1.2}}
+    assert poller.stats.changed_symbols == 1
+    assert poller.stats.changed_fields == 1
+
+    # Nothing moved, subscribers are not called
+    assert poller.poll_once() == {}
+    assert len(received) == 2
+    assert poller.stats.cycles == 3
+    assert poller.snapshot()[0].tolist()[:2] == [1.0, 1.2]
+
+
+def test_poller_thread_uses_calendar_delay(quotes_table):
+    client = mock.Mock()
+    client.quotes_table.side_effect = quotes_table({"AAPL": (1.0, 1.1)})
+    calendar = mock.Mock()
+    calendar.poll_delay.return_value = 60.0
+
+    polled = threading.Event()
+    poller = QuotePoller(client, ["AAPL"], interval=0.01, calendar=calendar)
+    poller.subscribe(lambda delta: polled.set())
+    poller.start()
+    assert polled.wait(5)
+    poller.stop(timeout=5)
+
+    calendar.poll_delay.assert_called_with(0.01, outside_rth=False)
+    assert poller.stats.cycles == 1
+
+
+def test_poller_survives_calendar_errors(quotes_table):
+    client = mock.Mock()
+    prices = iter(range(1000))
+    client.quotes_table.side_effect = lambda symbols, fields: quotes_table(
+        {"AAPL": (float(next(prices)), 1.1)}
+    )(symbols, fields)
+    calendar = mock.Mock()
+    calendar.poll_delay.side_effect = ConnectionError("hours unavailable")
+
+    cycles = threading.Semaphore(0)
+    poller = QuotePoller(client, ["AAPL"], interval=0.01, calendar=calendar)
+    poller.subscribe(lambda delta: cycles.release())
+    poller.start()
+    # Falls back to the base interval and keeps polling
+    for _ in range(3):
+        assert cycles.acquire(timeout=5)
+    poller.stop(timeout=5)
+
+    assert poller.stats.cycles >= 3
+    assert poller.stats.errors >= 2
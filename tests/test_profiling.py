@@ -0,0 +1,106 @@
+import os
+import json
+import tracemalloc
+from datetime import datetime
+
+import responses
+
+from tdam_api import TDClient
+from tdam_api.profiling import Profiler, NullProfiler
+from tdam_api.urls import Urls
+
+apikey = os.environ["TDAM_APP_ID"]
+
+
+def test_spans_and_stats():
+    p = Profiler()
+    for _ in range(3):
+        with p.span("outer"):
+            with p.span("outer.inner"):
+                data = [list(range(10)) for _ in range(100)]
+    assert data
+
+    stats = p.stats()
+    assert stats["outer"].count == stats["outer.inner"].count == 3
+    assert stats["outer"].wall >= stats["outer.inner"].wall > 0
+    assert stats["outer.inner"].max_wall <= stats["outer.inner"].wall
+    assert {s.depth for s in p.spans if s.name == "outer"} == {0}
+    assert {s.depth for s in p.spans if s.name == "outer.inner"} == {1}
+
+    report = p.report().splitlines()
+    assert len(report) == 3
+    assert report[1].startswith("outer ")
+
+    p.reset()
+    assert p.stats() == {} and p.spans == []
+
+
+def test_trace_memory():
+    p = Profiler(trace_memory=True)
+    with p.span("alloc"):
+        data = bytearray(1 << 20)
+    p.stop()
+    assert len(data) and p.stats()["alloc"].bytes >= 1 << 20
+    assert not tracemalloc.is_tracing()
+
+
+def test_stop_keeps_callers_tracing():
+    tracemalloc.start()
+    try:
+        p = Profiler(trace_memory=True)
+        p.stop()
+        assert tracemalloc.is_tracing()
+    finally:
+        tracemalloc.stop()
+
+
+def test_client_reenable_releases_tracing():
+    c = TDClient(authenticated=False)
+    first = c.enable_profiling(trace_memory=True)
+    second = c.enable_profiling(trace_memory=True)
+    assert first is not second
+    assert tracemalloc.is_tracing()
+    c.disable_profiling()
+    assert not tracemalloc.is_tracing()
+
+
+@responses.activate
+def test_client_profiling(tmp_path, chain_json):
+    c = TDClient(authenticated=False)
+    assert isinstance(c.profiler, NullProfiler)
+    responses.add(responses.GET, Urls.option_chain, json=chain_json)
+    c.get_option_chain("AAPL", "2019-08-23")
+
+    profiler = c.enable_profiling()
+    chain = c.get_option_chain("AAPL", "2019-08-23")
+    assert len(list(chain.options())) > 0
+    stats = profiler.stats()
+    assert stats["get_option_chain"].count == 1
+    for phase in ("request", "json", "walk"):
+        assert stats["option_chain." + phase].count == 1
+    assert stats["get_option_chain.options"].count == 1
+
+    candles = [
+        {"open": 1, "high": 2, "low": 0, "close": 1, "volume": 10, "datetime": 0}
+    ]
+    responses.add(
+        responses.GET,
+        Urls.history % "AAPL",
+        json={"candles": candles, "symbol": "AAPL", "empty": False},
+    )
+    c.get_history_df("AAPL", datetime(2019, 1, 1), datetime(2019, 1, 31))
+    assert {"get_history_df", "get_history_df.frame", "get_history.json"} <= set(
+        profiler.stats()
+    )
+
+    path = str(tmp_path / "trace.json")
+    profiler.write_chrome_trace(path)
+    with open(path) as f:
+        trace = json.load(f)
+    events = trace["traceEvents"]
+    assert len(events) == len(profiler.spans)
+    assert all(e["ph"] == "X" and e["dur"] >= 0 for e in events)
+
+    c.disable_profiling()
+    assert not c.profiler.enabled
+    c.disable_profiling()
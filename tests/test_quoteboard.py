@@ -0,0 +1,131 @@
+import sys
+import json
+import threading
+import subprocess
+from unittest import mock
+
+import numpy as np
+import pytest
+
+from tdam_api.entities import InvalidArgument
+from tdam_api.quotetable import QuoteTable
+from tdam_api.quoteboard import QuoteBoardPublisher, QuoteBoardReader
+
+
+@pytest.fixture
+def publisher(tmp_path):
+    client = mock.Mock()
+    pub = QuoteBoardPublisher(
+        client,
+        ["AAPL", "MSFT"],
+        fields=["bidPrice", "askPrice"],
+        path=str(tmp_path / "board"),
+    )
+    yield pub
+    pub.close()
+
+
+def test_publish_and_read(publisher, quotes_table):
+    client = publisher.poller._client
+    reader = QuoteBoardReader(publisher.path)
+    assert reader.symbols == ["AAPL", "MSFT"]
+    assert reader.fields == ["bidPrice", "askPrice"]
+    assert reader.sequence == 0
+    assert np.isnan(reader.view()).all()
+
+    client.quotes_table.side_effect = quotes_table(
+        {"AAPL": (1.0, 1.1), "MSFT": (2.0, 2.1)}
+    )
+    publisher.poll_once()
+    seq, values = reader.snapshot()
+    assert seq == publisher.sequence == 2
+    assert values.tolist() == [[1.0, 1.1], [2.0, 2.1]]
+
+    client.quotes_table.side_effect = quotes_table(
+        {"AAPL": (1.0, 1.1), "MSFT": (2.0, 2.2)}
+    )
+    publisher.poll_once()
+    assert reader.changed_since(seq) == ["MSFT"]
+    assert reader.get("msft") == {"bidPrice": 2.0, "askPrice": 2.2}
+    assert reader.view()[1, 1] == 2.2
+
+    # Nothing changed, no new publish
+    publisher.poll_once()
+    assert reader.sequence == 4
+    reader.close()
+
+
+def test_reader_in_other_process(publisher, quotes_table):
+    client = publisher.poller._client
+    client.quotes_table.side_effect = quotes_table(
+        {"AAPL": (1.0, 1.1), "MSFT": (2.0, 2.1)}
+    )
+    publisher.poll_once()
+
+    code = (
+        "import sys, json\n"
+        "from tdam_api.quoteboard import QuoteBoardReader\n"
+        "r = QuoteBoardReader(sys.argv[1])\n"
+        "print(json.dumps(r.get('AAPL')))\n"
+    )
+    out = subprocess.check_output([sys.executable, "-c", code, publisher.path])
+    assert json.loads(out) == {"bidPrice": 1.0, "askPrice": 1.1}
+
+
+def test_reader_rejects_unknown_file(tmp_path):
+    path = tmp_path / "junk"
+    path.write_bytes(b"\0" * 128)
+    with pytest.raises(InvalidArgument):
+        QuoteBoardReader(str(path))
+
+
+def test_long_symbols_and_fields(tmp_path):
+    client = mock.Mock()
+    symbols = ["GOOGL_082319C1200.5", "GOOGL_082319C1200", "AAPL"]
+    field = "theoreticalOptionValueAdjusted_long"
+    client.quotes_table.side_effect = lambda s, f: QuoteTable.from_response(
+        {sym: {"symbol": sym, field: float(i)} for i, sym in enumerate(symbols)}, f
+    )
+    pub = QuoteBoardPublisher(client, symbols, fields=[field], path=str(tmp_path / "b"))
+    pub.poll_once()
+
+    # Names longer than the default slots come back whole
+    reader = QuoteBoardReader(pub.path)
+    assert reader.symbols == symbols
+    assert reader.fields == [field]
+    assert reader.get("GOOGL_082319C1200.5") == {field: 0.0}
+    assert reader.get("GOOGL_082319C1200") == {field: 1.0}
+    reader.close()
+    pub.close()
+
+
+def test_read_during_large_publish(tmp_path):
+    symbols = [f"S{i}" for i in range(5000)]
+    fields = ["bidPrice", "askPrice", "lastPrice", "mark"]
+    path = str(tmp_path / "board")
+    pub = QuoteBoardPublisher(mock.Mock(), symbols, fields=fields, path=path)
+    reader = QuoteBoardReader(pub.path)
+    delta = {s: dict.fromkeys(fields, 0.0) for s in symbols}
+
+    done = threading.Event()
+
+    def publish():
+        for i in range(200):
+            pub.poller._last = np.full((len(symbols), len(fields)), float(i))
+            pub.publish(delta)
+        done.set()
+
+    writer = threading.Thread(target=publish)
+    writer.start()
+    reads = 0
+    while not done.is_set() or reads == 0:
+        seq, values = reader.snapshot()
+        # Never torn, every cell comes from the same publish
+        assert seq % 2 == 0
+        if seq:
+            assert (values == values[0, 0]).all()
+        reads += 1
+    writer.join()
+    assert reader.changed_since(0) == symbols
+    reader.close()
+    pub.close()
@@ -0,0 +1,89 @@
+import copy
+
+import numpy as np
+import pytest
+
+from tdam_api.entities import Option, OptionChain, InvalidArgument
+from tdam_api.recorder import ChainRecorder, ChainLog
+
+CONTRACT = "AAPL_082319C200"
+
+
+def to_chain(output: dict) -> OptionChain:
+    calls = {}
+    puts = {}
+    for options in output["callExpDateMap"].values():
+        for s in options.keys():
+            calls[s] = Option(options[s][0])
+    for options in output["putExpDateMap"].values():
+        for s in options.keys():
+            puts[s] = Option(options[s][0])
+    return OptionChain(calls, puts)
+
+
+def contract(output: dict, strike: str = "200.0") -> dict:
+    return output["callExpDateMap"]["2019-08-23:2"][strike][0]
+
+
+def test_record_and_reconstruct(tmp_path, chain_json):
+    output = chain_json
+    rec = ChainRecorder(str(tmp_path), "aapl", "2019-08-23", keyframe_interval=3)
+    n_contracts = len(list(to_chain(output).options()))
+
+    snapshots = []
+    written = []
+    for i in range(6):
+        if i:
+            contract(output)["bid"] += 0.05
+            contract(output)["totalVolume"] += 10
+        snapshots.append(copy.deepcopy(output))
+        written.append(rec.append(to_chain(output), timestamp=1000 * (i + 1)))
+
+    # Only the two moving fields are stored between keyframes
+    assert written[1] == written[2] == 2
+    assert written[3] == written[0] > 2 * n_contracts
+    assert written[4] == 2
+
+    log = ChainLog(rec.path)
+    assert len(log) == 6
+    assert len(log.contracts) == n_contracts
+    assert log.values_at(500).shape == (n_contracts, len(log.fields))
+    assert np.isnan(log.values_at(500)).all()
+
+    for i, snap in enumerate(snapshots):
+        state = log.as_of(1000 * (i + 1) + 500)
+        expected = contract(snap)
+        assert state[CONTRACT]["bid"] == expected["bid"]
+        assert state[CONTRACT]["totalVolume"] == expected["totalVolume"]
+        assert state[CONTRACT]["ask"] == expected["ask"]
+
+    timestamps, values = log.history(CONTRACT, start=2000, end=5000)
+    assert timestamps.tolist() == [2000, 3000, 4000, 5000]
+    bid = values[:, log.fields.index("bid")]
+    assert bid.tolist() == [contract(s)["bid"] for s in snapshots[1:5]]
+    ask = values[:, log.fields.index("ask")]
+    assert ask.tolist() == [contract(snapshots[0])["ask"]] * 4
+
+    with pytest.raises(InvalidArgument):
+        log.history("NOPE")
+
+
+def test_reopen_and_removed_contracts(tmp_path, chain_json):
+    output = chain_json
+    rec = ChainRecorder(str(tmp_path), "AAPL", "2019-08-23")
+    rec.append(to_chain(output), timestamp=1000)
+
+    # Reopening continues the same log from its last state
+    rec = ChainRecorder(str(tmp_path), "AAPL", "2019-08-23")
+    assert rec.append(to_chain(output), timestamp=2000) == 0
+    with pytest.raises(InvalidArgument):
+        rec.append(to_chain(output), timestamp=1500)
+
+    del output["callExpDateMap"]["2019-08-23:2"]["200.0"]
+    assert rec.append(to_chain(output), timestamp=3000) > 0
+    log = rec.reader()
+    assert CONTRACT in log.as_of(2000)
+    assert CONTRACT not in log.as_of(3000)
+
+    with pytest.raises(InvalidArgument):
+        ChainRecorder(str(tmp_path), "AAPL", "2019-08-23", fields=["bid"])
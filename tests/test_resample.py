@@ -0,0 +1,94 @@
+from datetime import datetime, timezone
+
+import pytest
+
+from tdam_api.entities import InvalidArgument
+from tdam_api.resample import resample, Resampler
+
+# 2019-08-23 09:00 ET, half an hour before the open
+START_MS = int(datetime(2019, 8, 23, 13, 0, tzinfo=timezone.utc).timestamp()) * 1000
+
+
+def minute_candles(n: int, start_ms: int = START_MS):
+    out = []
+    for i in range(n):
+        price = 100.0 + i
+        out.append(
+            {
+                "open": price,
+                "high": price + 0.5,
+                "low": price - 0.5,
+                "close": price + 0.25,
+                "volume": 10.0,
+                "datetime": start_ms + i * 60000,
+            }
+        )
+    return out
+
+
+def test_resample_intraday():
+    candles = minute_candles(60)
+    bars = resample(candles, "5min", outside_rth=True)
+    assert len(bars) == 12
+    assert bars[0] == {
+        "open": 100.0,
+        "high": 104.5,
+        "low": 99.5,
+        "close": 104.25,
+        "volume": 50.0,
+        "datetime": START_MS,
+    }
+
+    # Regular hours only, the first bar starts at the 09:30 open
+    bars = resample(candles, "15min")
+    assert len(bars) == 2
+    assert bars[0]["datetime"] == START_MS + 30 * 60000
+    assert bars[0]["open"] == 130.0
+    assert bars[0]["volume"] == 150.0
+
+    assert resample([], "5min") is None
+    with pytest.raises(InvalidArgument):
+        resample(candles, "2min")
+
+
+def test_resample_daily():
+    # 09:00 ET through 17:59 ET
+    candles = minute_candles(9 * 60)
+    rth = resample(candles, "d")
+    full = resample(candles, "d", outside_rth=True)
+    assert len(rth) == len(full) == 1
+    assert rth[0]["open"] == 130.0
+    assert rth[0]["close"] == 100.0 + 419 + 0.25
+    assert rth[0]["volume"] == 390 * 10.0
+    assert full[0]["volume"] == 540 * 10.0
+    # Bars are stamped with the exchange local midnight
+    assert rth[0]["datetime"] == START_MS - 9 * 3600 * 1000
+
+
+def test_incremental_matches_batch():
+    candles = minute_candles(120)
+    r = Resampler("10min", outside_rth=True)
+    completed = []
+    for i in range(0, len(candles), 7):
+        completed.extend(r.update(candles[i : i + 7]))
+
+    expected = resample(candles, "10min", outside_rth=True)
+    assert completed == expected[:-1]
+    assert r.bars() == expected
+    assert r.bars(include_partial=False) == expected[:-1]
+
+    # Late candles for an already closed bar are ignored
+    assert r.update(candles[:3]) == []
+    assert r.bars() == expected
+
+
+def test_incremental_unsorted_batch():
+    candles = minute_candles(12)
+    r = Resampler("5min", outside_rth=True)
+    completed = r.update(candles[::-1])
+
+    # Batches are put in time order first, same as resample()
+    expected = resample(candles, "5min", outside_rth=True)
+    assert completed == expected[:-1]
+    assert completed[0]["close"] == candles[4]["close"]
+    assert r.bars() == expected
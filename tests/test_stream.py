@@ -0,0 +1,108 @@
+import json
+from datetime import datetime
+from unittest import mock
+
+import numpy as np
+
+from tdam_api.stream import (
+    history_source,
+    ndjson_source,
+    csv_source,
+    merge_sources,
+    iter_blocks,
+)
+
+
+def candles(timestamps, price: float = 1.0):
+    return [
+        {
+            "open": price,
+            "high": price,
+            "low": price,
+            "close": price + i,
+            "volume": 10.0,
+            "datetime": ts,
+        }
+        for i, ts in enumerate(timestamps)
+    ]
+
+
+def test_merge_sources():
+    sources = {
+        "AAPL": iter(candles([1, 2, 4])),
+        "MSFT": iter(candles([2, 3, 4], price=2.0)),
+    }
+    merged = list(merge_sources(sources))
+    assert [ts for ts, _ in merged] == [1, 2, 3, 4]
+    assert sorted(merged[1][1]) == ["AAPL", "MSFT"]
+    assert list(merged[2][1]) == ["MSFT"]
+    assert merged[3][1]["MSFT"]["close"] == 4.0
+
+
+def test_merge_is_lazy():
+    consumed = []
+
+    def source(symbol, timestamps):
+        for c in candles(timestamps):
+            consumed.append((symbol, c["datetime"]))
+            yield c
+
+    merged = merge_sources(
+        {"A": source("A", range(0, 1000, 2)), "B": source("B", range(1, 1000, 2))}
+    )
+    next(merged)
+    next(merged)
+    assert len(consumed) <= 4
+
+
+def test_iter_blocks():
+    sources = {
+        "AAPL": candles([1, 2, 4]),
+        "MSFT": candles([2, 3, 4], price=2.0),
+    }
+    blocks = list(iter_blocks(sources, block_size=3, fields=["close", "volume"]))
+    assert [b[0].tolist() for b in blocks] == [[1, 2, 3], [4]]
+    ts, values = blocks[0]
+    assert values.shape == (3, 2, 2)
+    assert values[0, 0].tolist() == [1.0, 10.0]
+    assert np.isnan(values[0, 1]).all()
+    assert values[2, 1].tolist() == [3.0, 10.0]
+    assert np.isnan(values[2, 0]).all()
+    assert blocks[1][1][0, :, 0].tolist() == [3.0, 4.0]
+
+
+def test_file_sources(tmp_path):
+    data = candles([1, 2, 3])
+    ndjson = tmp_path / "aapl.ndjson"
+    ndjson.write_text("".join(json.dumps(c) + "\n" for c in data))
+    csv_path = tmp_path / "aapl.csv"
+    rows = ["open,high,low,close,volume,datetime"]
+    rows += [
+        ",".join(
+            str(c[k]) for k in ["open", "high", "low", "close", "volume", "datetime"]
+        )
+        for c in data
+    ]
+    csv_path.write_text("\n".join(rows) + "\n")
+
+    assert list(ndjson_source(str(ndjson))) == data
+    assert list(csv_source(str(csv_path))) == data
+
+
+def test_history_source_windows():
+    client = mock.Mock()
+    client.get_history.side_effect = [candles([1, 2]), candles([2, 3])]
+    out = list(
+        history_source(
+            client,
+            "AAPL",
+            datetime(2019, 8, 1),
+            datetime(2019, 8, 3),
+            freq="1min",
+        )
+    )
+    assert [c["datetime"] for c in out] == [1, 2, 3]
+    assert client.get_history.call_count == 2
+    _, kwargs = client.get_history.call_args_list[0]
+    assert kwargs["start_dt"] == datetime(2019, 8, 1)
+    assert kwargs["end_dt"] == datetime(2019, 8, 2)
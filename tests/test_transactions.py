@@ -0,0 +1,139 @@
+import os
+import json
+from datetime import date, timedelta
+from urllib.parse import urlparse, parse_qs
+
+import pytest
+import responses
+
+from tdam_api import TDClient
+from tdam_api.entities import Transaction, InvalidArgument
+from tdam_api.transactions import TransactionCache, date_windows, is_closed
+from tdam_api.urls import Urls
+
+apikey = os.environ["TDAM_APP_ID"]
+
+ACCOUNT = "123"
+
+
+def client(**kwargs) -> TDClient:
+    return TDClient(access_token="x", refresh_token="x", app_id=apikey, **kwargs)
+
+
+def transactions_callback(request):
+    # Two transactions per requested window, newest first like the API
+    query = parse_qs(urlparse(request.url).query)
+    lo, hi = query["startDate"][0], query["endDate"][0]
+    body = [
+        {
+            "transactionId": hi,
+            "type": "TRADE",
+            "transactionDate": hi + "T15:00:00+0000",
+            "netAmount": -10.0,
+            "transactionItem": {"amount": 1.0, "instrument": {"symbol": "AAPL"}},
+        },
+        {
+            "transactionId": lo,
+            "type": "TRADE",
+            "transactionDate": lo + "T15:00:00+0000",
+            "netAmount": 10.0,
+            "transactionItem": {"amount": 1.0, "instrument": {"symbol": "AAPL"}},
+        },
+    ]
+    return (200, {}, json.dumps(body))
+
+
+def test_date_windows():
+    windows = list(date_windows(date(2019, 1, 1), date(2019, 3, 1), timedelta(30)))
+    assert windows[0][0] <= date(2019, 1, 1) <= windows[0][1]
+    assert windows[-1][0] <= date(2019, 3, 1) <= windows[-1][1]
+    for lo, hi in windows:
+        assert hi - lo == timedelta(days=29)
+    for (_, hi), (lo, _) in zip(windows, windows[1:]):
+        assert lo - hi == timedelta(days=1)
+
+    # Windows do not move with the start date
+    shifted = list(date_windows(date(2019, 1, 2), date(2019, 3, 2), timedelta(30)))
+    assert shifted == windows
+    assert list(date_windows(date(2019, 1, 1), date(2019, 1, 1), timedelta(1))) == [
+        (date(2019, 1, 1), date(2019, 1, 1))
+    ]
+    assert is_closed(windows[0], today=windows[1][0])
+    assert not is_closed(windows[-1], today=windows[-1][1])
+
+
+@responses.activate
+def test_iter_transactions():
+    c = client()
+    responses.add_callback(
+        responses.GET,
+        Urls.transactions % ACCOUNT,
+        callback=transactions_callback,
+    )
+    out = c.iter_transactions(
+        ACCOUNT, date(2019, 1, 1), date(2019, 3, 31), window=timedelta(days=30)
+    )
+    # Nothing is fetched until the generator is consumed
+    assert len(responses.calls) == 0
+
+    out = list(out)
+    # 2018-12-15..2019-01-13 up to 2019-03-15..2019-04-13
+    assert len(responses.calls) == 4
+    assert all(isinstance(t, Transaction) for t in out)
+    dates = [t.transactionDate[:10] for t in out]
+    assert dates == sorted(dates)
+    # Trimmed to the requested range
+    assert dates[0] == "2019-01-13" and dates[-1] == "2019-03-15"
+    assert len(out) == 6
+
+    # Past windows are closed and served from the cache, also for a moved range
+    assert len(c.get_transactions(ACCOUNT, date(2019, 1, 1), date(2019, 3, 31))) == 6
+    assert len(c.get_transactions(ACCOUNT, date(2019, 1, 14), date(2019, 4, 1))) == 5
+    assert len(responses.calls) == 4
+
+    with pytest.raises(InvalidArgument):
+        c.iter_transactions(ACCOUNT, date(2019, 2, 1), date(2019, 1, 1))
+
+
+@responses.activate
+def test_open_window_not_cached(tmp_path):
+    c = client(transactions_cache=TransactionCache(str(tmp_path)))
+    responses.add_callback(
+        responses.GET,
+        Urls.transactions % ACCOUNT,
+        callback=transactions_callback,
+    )
+    start = date.today() - timedelta(days=40)
+    n = len(list(date_windows(start, date.today())))
+    c.get_transactions(ACCOUNT, start)
+    c.get_transactions(ACCOUNT, start)
+    # Only the window holding today is fetched again, and never past today
+    assert len(responses.calls) == n + 1
+    assert responses.calls[-1].request.params["endDate"] == date.today().isoformat()
+    assert len(os.listdir(str(tmp_path))) == n - 1
+
+    # A new client reuses the closed windows from disk
+    c = client(transactions_cache=TransactionCache(str(tmp_path)))
+    c.get_transactions(ACCOUNT, start)
+    assert len(responses.calls) == n + 2
+
+    # Windows starting after today are not requested
+    c.get_transactions(ACCOUNT, start, date.today() + timedelta(days=90))
+    assert len(responses.calls) == n + 3
+    for call in responses.calls:
+        assert call.request.params["startDate"] <= call.request.params["endDate"]
+
+
+@responses.activate
+def test_transactions_df():
+    c = client()
+    responses.add_callback(
+        responses.GET,
+        Urls.transactions % ACCOUNT,
+        callback=transactions_callback,
+    )
+    df = c.get_transactions_df(ACCOUNT, date(2019, 1, 1), date(2019, 1, 30))
+    assert len(df) == 2
+    assert df.index.is_monotonic_increasing
+    assert "transactionItem.instrument.symbol" in df.columns
+    assert df["netAmount"].sum() == 0
@@ -0,0 +1,86 @@
+import math
+from datetime import date
+from unittest import mock
+
+import numpy as np
+import pytest
+
+from tdam_api import TDClient
+from tdam_api.entities import Option, OptionChain, InvalidArgument
+from tdam_api.volsurface import VolSurface
+
+AS_OF = date(2019, 8, 1)
+
+
+def make_chain(vols: dict) -> OptionChain:
+    # vols maps strike -> (call vol %, put vol %), deltas fall with strike
+    calls = {}
+    puts = {}
+    strikes = sorted(vols)
+    for i, strike in enumerate(strikes):
+        key = str(float(strike))
+        call_vol, put_vol = vols[strike]
+        call_delta = 0.9 - 0.8 * i / (len(strikes) - 1)
+        calls[key] = Option(
+            {"strikePrice": strike, "volatility": call_vol, "delta": call_delta}
+        )
+        puts[key] = Option(
+            {"strikePrice": strike, "volatility": put_vol, "delta": call_delta - 1}
+        )
+    return OptionChain(calls, puts)
+
+
+def test_flat_surface():
+    chain = make_chain({90: (20.0, 20.0), 100: (20.0, 20.0), 110: (20.0, 20.0)})
+    surface = VolSurface({"2019-08-31": chain, "2019-09-30": chain}, as_of=AS_OF)
+    assert surface.expiries == ["2019-08-31", "2019-09-30"]
+    assert surface.iv(100, "2019-09-15") == pytest.approx(0.2)
+    assert surface.iv_many([80, 95, 130], "2019-12-31") == pytest.approx([0.2] * 3)
+    assert surface.iv_by_delta(0.5, "2019-08-31") == pytest.approx(0.2)
+
+
+def test_smile_and_term_structure():
+    near = make_chain({90: (-999.0, 30.0), 100: (25.0, 26.0), 110: (22.0, "NaN")})
+    far = make_chain({90: (35.0, 36.0), 100: (30.0, 31.0), 110: (27.0, 28.0)})
+    surface = VolSurface({"2019-08-31": near, "2019-10-30": far}, as_of=AS_OF)
+
+    # OTM side is used, missing values fall back to the other side
+    assert surface.iv(90, "2019-08-31") == pytest.approx(0.30)
+    assert surface.iv(100, "2019-08-31") == pytest.approx(0.25)
+    assert surface.iv(105, "2019-08-31") == pytest.approx(0.235)
+    assert surface.iv(100, "2019-10-30") == pytest.approx(0.30)
+
+    # Linear in total variance between expiries
+    t1, t2, t = 30 / 365, 90 / 365, 60 / 365
+    w = (t - t1) / (t2 - t1)
+    expected = math.sqrt(((1 - w) * 0.25**2 * t1 + w * 0.30**2 * t2) / t)
+    assert surface.iv(100, "2019-09-30") == pytest.approx(expected)
+    assert surface.iv(100, t) == pytest.approx(expected)
+
+    _, times, by_strike, by_delta = surface.grid()
+    assert by_strike.shape == (2, 3)
+    assert by_delta.shape == (2, len(surface.deltas))
+
+    # Refreshing one expiry only touches its row
+    far_row = surface._rows["2019-10-30"]
+    surface.update("2019-08-31", far)
+    surface.grid()
+    assert surface._rows["2019-10-30"] is far_row
+    assert surface.iv(100, "2019-08-31") == pytest.approx(0.30)
+
+    with pytest.raises(InvalidArgument):
+        VolSurface({}, as_of=AS_OF).iv(100, "2019-08-31")
+
+
+def test_get_vol_surface():
+    c = TDClient(authenticated=False)
+    chain = make_chain({90: (20.0, 20.0), 100: (20.0, 20.0), 110: (20.0, 20.0)})
+    with mock.patch.object(TDClient, "get_expirations") as exp, mock.patch.object(
+        TDClient, "get_option_chain"
+    ) as oc:
+        exp.return_value = ["2019-08-31", "2019-09-30"]
+        oc.return_value = chain
+        surface = c.get_vol_surface("aapl", as_of=AS_OF)
+        assert oc.call_count == 2
+        assert surface.expiries == ["2019-08-31", "2019-09-30"]
+        assert np.allclose(surface.grid()[2], 0.2)